@@ -1,26 +1,286 @@
+import os
+import tempfile
+from collections import Counter
+
 import numpy
 from numpy.ma.testutils import assert_equal
+from sortedcontainers import SortedList
+
+
+def read_file(input_file):
+    with open(input_file, 'r') as file:
+        return file.read()
 
 
 def read_input(input_file):
-    return numpy.array(
-        list(zip(*[map(int, input_line.split()) for input_line in open(input_file, 'r').readlines()])))
+    return parse_input(read_file(input_file))
+
+
+# Accepts str, bytes or any other buffer holding the puzzle input. The numbers are parsed in bulk by NumPy, and the
+# two columns are returned as the rows of an int64 array.
+def parse_input(buffer):
+    columns = parse_fixed_width(buffer.encode() if isinstance(buffer, str) else buffer)
+    if columns is not None:
+        return columns
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    if not text or text.isspace():
+        return numpy.zeros((2, 0), dtype=numpy.int64)
+    return numpy.fromstring(text, dtype=numpy.int64, sep=' ').reshape(-1, 2).T
+
+
+# The puzzle input has the same layout on every line, e.g. '12345   67890\n'. Then the lines can be viewed as rows of a
+# byte matrix, which is transposed once so that every character position is contiguous, and the numbers are built one
+# digit position at a time. Returns None for any other layout.
+def parse_fixed_width(buffer):
+    characters = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    newlines = numpy.flatnonzero(characters[:256] == ord('\n'))
+    if len(newlines) == 0 or len(characters) % (newlines[0] + 1) != 0:
+        return None
+    lines = characters.reshape(-1, newlines[0] + 1)
+    is_digit = (lines[0] >= ord('0')) & (lines[0] <= ord('9'))
+    starts = numpy.flatnonzero(is_digit[1:] & ~is_digit[:-1]) + 1
+    ends = numpy.flatnonzero(is_digit[:-1] & ~is_digit[1:]) + 1
+    if not is_digit[0] or len(starts) != 1 or len(ends) != 2:
+        return None
+    positions = numpy.ascontiguousarray(lines.T)
+    separators = (ends[0], starts[0]), (ends[1], lines.shape[1])
+    if not all((positions[start:end].T == lines[0, start:end]).all() for start, end in separators):
+        return None
+    columns = numpy.zeros((2, lines.shape[0]), dtype=numpy.int64)
+    for column, (start, end) in zip(columns, ((0, ends[0]), (starts[0], ends[1]))):
+        for position in range(start, end):
+            digits = positions[position] - numpy.uint8(ord('0'))
+            if (digits >= 10).any():
+                return None
+            column *= 10
+            column += digits
+    return columns
+
+
+def total_distance(list_a, list_b):
+    return int(numpy.abs(numpy.sort(list_a) - numpy.sort(list_b)).sum())
+
+
+# Each distinct location ID contributes id * (count in list a) * (count in list b), so only the distinct values of the
+# two lists need to be matched, which is O(n log n) instead of comparing every ID in list a to all of list b.
+def similarity_score(list_a, list_b):
+    values_a, counts_a = numpy.unique(list_a, return_counts=True)
+    values_b, counts_b = numpy.unique(list_b, return_counts=True)
+    if len(values_b) == 0:
+        return 0
+    indices = numpy.searchsorted(values_b, values_a)
+    indices[indices == len(values_b)] = 0
+    common = values_b[indices] == values_a
+    return int((values_a[common] * counts_a[common] * counts_b[indices[common]]).sum())
+
+
+# Keeps both lists sorted while location IDs are added and removed. The similarity score is updated in O(1) per change,
+# since only the ID that changes contributes differently. The distance pairs the lists by rank, and one change shifts
+# the pairing of every larger ID, so the distances up to the smallest changed rank are kept as a prefix sum and only
+# the pairs after it are summed again when the distance is asked for.
+class LocationLists:
+    def __init__(self, list_a=(), list_b=()):
+        self._lists = SortedList(int(location_id) for location_id in list_a), SortedList(
+            int(location_id) for location_id in list_b)
+        self._counts = Counter(self._lists[0]), Counter(self._lists[1])
+        self._similarity = sum(location_id * count * self._counts[1][location_id] for location_id, count in
+                               self._counts[0].items())
+        self._distance_prefix = numpy.zeros(1, dtype=numpy.int64)
+
+    @staticmethod
+    def from_file(input_file):
+        return LocationLists.from_buffer(read_file(input_file))
+
+    @staticmethod
+    def from_buffer(buffer):
+        list_a, list_b = parse_input(buffer)
+        return LocationLists(list_a.tolist(), list_b.tolist())
+
+    def __len__(self):
+        return min(len(self._lists[0]), len(self._lists[1]))
+
+    def add(self, list_index, location_id):
+        location_id = int(location_id)
+        self._changed_from(self._lists[list_index].bisect_left(location_id))
+        self._lists[list_index].add(location_id)
+        self._counts[list_index][location_id] += 1
+        self._similarity += location_id * self._counts[1 - list_index][location_id]
+
+    def remove(self, list_index, location_id):
+        location_id = int(location_id)
+        if self._counts[list_index][location_id] == 0:
+            raise Exception(f'Location ID {location_id} is not in list {list_index}.')
+        self._changed_from(self._lists[list_index].bisect_left(location_id))
+        self._lists[list_index].remove(location_id)
+        self._counts[list_index][location_id] -= 1
+        self._similarity -= location_id * self._counts[1 - list_index][location_id]
+
+    def _changed_from(self, rank):
+        if rank + 1 < len(self._distance_prefix):
+            self._distance_prefix = self._distance_prefix[:rank + 1]
+
+    def similarity_score(self):
+        return self._similarity
+
+    def total_distance(self):
+        n_pairs = len(self)
+        first_rank = min(len(self._distance_prefix) - 1, n_pairs)
+        if first_rank < n_pairs:
+            list_a = numpy.fromiter(self._lists[0].islice(first_rank, n_pairs), dtype=numpy.int64)
+            list_b = numpy.fromiter(self._lists[1].islice(first_rank, n_pairs), dtype=numpy.int64)
+            distances = numpy.cumsum(numpy.abs(list_a - list_b)) + self._distance_prefix[first_rank]
+            self._distance_prefix = numpy.concatenate((self._distance_prefix[:first_rank + 1], distances))
+        return int(self._distance_prefix[n_pairs])
 
 
 def solve_part1(input_file):
-    list_a, list_b = numpy.sort(read_input(input_file))
-    return sum(abs(list_a - list_b))
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer):
+    list_a, list_b = parse_input(buffer)
+    return total_distance(list_a, list_b)
 
 
 def solve_part2(input_file):
-    list_a, list_b = read_input(input_file)
-    return sum(map(lambda a: a * numpy.count_nonzero(list_b == a), list_a))
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer):
+    list_a, list_b = parse_input(buffer)
+    return similarity_score(list_a, list_b)
+
+
+# Out-of-core mode for inputs larger than memory. The file is read chunk_size bytes at a time, both columns of every
+# chunk are sorted and written to a memory-mapped temporary file, and the sorted runs of each list are merged again
+# block_size IDs per run at a time, so only a few blocks per run are in memory at once.
+def write_sorted_runs(input_file, directory, chunk_size):
+    runs = [], []
+    with open(input_file, 'rb') as file:
+        remainder = b''
+        while True:
+            data = file.read(chunk_size)
+            if data:
+                data = remainder + data
+                end = data.rfind(b'\n') + 1
+                if end == 0:
+                    remainder = data
+                    continue
+                chunk, remainder = data[:end], data[end:]
+            else:
+                chunk, remainder = remainder, b''
+            for list_runs, column in zip(runs, parse_input(chunk)):
+                if len(column) == 0:
+                    continue
+                run_file = os.path.join(directory, f'run_{len(runs[0])}_{len(runs[1])}.npy')
+                run = numpy.lib.format.open_memmap(run_file, mode='w+', dtype=numpy.int64, shape=column.shape)
+                run[:] = numpy.sort(column)
+                run.flush()
+                del run
+                list_runs.append(numpy.load(run_file, mmap_mode='r'))
+            if not data:
+                return runs
+
+
+# Yields the IDs of all runs in sorted order, one block at a time. Every step takes a block from each run and emits
+# everything up to the smallest of the last IDs of those blocks, which is complete since the runs are sorted.
+def merge_runs(runs, block_size):
+    positions = [0] * len(runs)
+    while True:
+        ends = [min(position + block_size, len(run)) for position, run in zip(positions, runs)]
+        active = [index for index in range(len(runs)) if positions[index] < ends[index]]
+        if not active:
+            return
+        bound = min(runs[index][ends[index] - 1] for index in active)
+        pieces = []
+        for index in active:
+            block = runs[index][positions[index]:ends[index]]
+            cut = numpy.searchsorted(block, bound, 'right')
+            pieces.append(block[:cut])
+            positions[index] += cut
+        yield numpy.sort(numpy.concatenate(pieces))
+
+
+# Turns sorted blocks into distinct IDs with their counts, holding back the last ID of a block in case the next block
+# starts with the same ID, so that every ID is yielded exactly once.
+def distinct_counts(blocks):
+    held_value, held_count = None, 0
+    for block in blocks:
+        values, counts = numpy.unique(block, return_counts=True)
+        if held_value is not None:
+            if values[0] == held_value:
+                counts[0] += held_count
+            else:
+                values = numpy.concatenate(([held_value], values))
+                counts = numpy.concatenate(([held_count], counts))
+        held_value, held_count = values[-1], counts[-1]
+        if len(values) > 1:
+            yield values[:-1], counts[:-1]
+    if held_value is not None:
+        yield numpy.array([held_value]), numpy.array([held_count])
+
+
+def streamed_total_distance(blocks_a, blocks_b):
+    distance = 0
+    pending_a, pending_b = numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+    for block_a in blocks_a:
+        pending_a = numpy.concatenate((pending_a, block_a))
+        while len(pending_b) < len(pending_a):
+            block_b = next(blocks_b, None)
+            if block_b is None:
+                break
+            pending_b = numpy.concatenate((pending_b, block_b))
+        n_pairs = min(len(pending_a), len(pending_b))
+        distance += int(numpy.abs(pending_a[:n_pairs] - pending_b[:n_pairs]).sum())
+        pending_a, pending_b = pending_a[n_pairs:], pending_b[n_pairs:]
+    return distance
+
+
+# Both streams are consumed up to the smaller of their last buffered IDs in every step, so an ID of one list is always
+# matched against all occurrences of it in the other list.
+def streamed_similarity_score(distinct_a, distinct_b):
+    similarity = 0
+    streams = distinct_a, distinct_b
+    buffers = [(numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64))] * 2
+    while True:
+        for index, stream in enumerate(streams):
+            if len(buffers[index][0]) == 0:
+                buffers[index] = next(stream, buffers[index])
+        if len(buffers[0][0]) == 0 or len(buffers[1][0]) == 0:
+            return similarity
+        bound = min(buffers[0][0][-1], buffers[1][0][-1])
+        cuts = [numpy.searchsorted(values, bound, 'right') for values, counts in buffers]
+        (values_a, counts_a), (values_b, counts_b) = [(values[:cut], counts[:cut]) for (values, counts), cut in
+                                                      zip(buffers, cuts)]
+        common, indices_a, indices_b = numpy.intersect1d(values_a, values_b, assume_unique=True, return_indices=True)
+        similarity += int((common * counts_a[indices_a] * counts_b[indices_b]).sum())
+        buffers = [(values[cut:], counts[cut:]) for (values, counts), cut in zip(buffers, cuts)]
+
+
+def solve_parts_out_of_core(input_file, chunk_size=1 << 26, block_size=1 << 20, temporary_directory=None):
+    with tempfile.TemporaryDirectory(dir=temporary_directory) as directory:
+        runs_a, runs_b = write_sorted_runs(input_file, directory, chunk_size)
+        distance = streamed_total_distance(merge_runs(runs_a, block_size), merge_runs(runs_b, block_size))
+        similarity = streamed_similarity_score(distinct_counts(merge_runs(runs_a, block_size)),
+                                               distinct_counts(merge_runs(runs_b, block_size)))
+        # The memory maps have to be closed before the temporary directory can be removed
+        del runs_a, runs_b
+    return distance, similarity
+
 
+if __name__ == '__main__':
+    assert_equal(solve_part1('test1.txt'), 11, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), 1189304, 'Incorrect answer to part 1.')
+    assert_equal(solve_part2('test1.txt'), 31, 'Incorrect answer to example.')
+    assert_equal(solve_part2('input.txt'), 24349736, 'Incorrect answer to part 2.')
 
-assert_equal(solve_part1('test1.txt'), 11, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), 1189304, 'Incorrect answer to part 1.')
-assert_equal(solve_part2('test1.txt'), 31, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), 24349736, 'Incorrect answer to part 2.')
+    locations = LocationLists.from_file('test1.txt')
+    assert_equal((locations.total_distance(), locations.similarity_score()), (11, 31), 'Incorrect incremental answer.')
+    locations.remove(1, 3)
+    locations.add(1, 4)
+    assert_equal((locations.total_distance(), locations.similarity_score()), (12, 26), 'Incorrect incremental answer.')
+    assert_equal(solve_parts_out_of_core('test1.txt', chunk_size=16, block_size=2), (11, 31),
+                 'Incorrect out-of-core answer.')
 
-print('Answer to part 1: ', solve_part1('input.txt'))
-print('Answer to part 2: ', solve_part2('input.txt'))
+    print('Answer to part 1: ', solve_part1('input.txt'))
+    print('Answer to part 2: ', solve_part2('input.txt'))
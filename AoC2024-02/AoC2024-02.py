@@ -1,17 +1,57 @@
+import functools
+import os
+import sys
 import time
 
 import numpy
 from numpy.ma.testutils import assert_equal
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import map_reduce  # noqa: E402
+
+
+# A vectorised report check takes about a microsecond, so the pool only pays off from about a hundred thousand reports
+MIN_PARALLEL_SIZE = 100_000
+
+
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
 
 def read_input(input_file: str) -> list[numpy.array]:
-    return [numpy.array(list(map(int, input_line.split()))) for input_line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[numpy.array]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [numpy.array(list(map(int, input_line.split()))) for input_line in text.splitlines()]
 
 
-def is_report_safe(report: numpy.array, dampener: bool = False):
+# The dampener is either a bool or the number of levels that may be removed from the report
+def is_report_safe(report: numpy.array, dampener: bool | int = False):
+    if dampener > 1:
+        return min_removals_to_safe(report) <= dampener
     return is_report_ascending_and_safe(report, dampener) or is_report_descending_and_safe(report, dampener)
 
 
+def min_removals_to_safe(report: numpy.array) -> int:
+    return len(report) - max(longest_safe_subsequence(report), longest_safe_subsequence(-report))
+
+
+# The longest chain of levels that each rise by 1 to 3 from the previous kept level. A chain ending at a level can
+# only continue from a chain ending at one of the three values below it, so the best chain ending at each value is
+# enough to extend the chains in one pass.
+def longest_safe_subsequence(report: numpy.array) -> int:
+    best_by_value = {}
+    longest = 0
+    for level in report.tolist():
+        length = 1 + max(best_by_value.get(level - step, 0) for step in range(1, 4))
+        best_by_value[level] = max(best_by_value.get(level, 0), length)
+        longest = max(longest, length)
+    return longest
+
+
 def is_report_descending_and_safe(report: numpy.array, dampener: bool = False) -> bool:
     return is_report_ascending_and_safe(-report, dampener)
 
@@ -40,14 +80,119 @@ def is_report_ascending_and_safe(report: numpy.array, dampener: bool = False) ->
     return True
 
 
+SAFE, DAMPENED, UNSAFE = 'safe', 'safe with dampener', 'unsafe'
+
+
+# Returns the classification of the report and, when the Problem Dampener is needed, the index of the level it removes
+def classify_report(report: numpy.array) -> (str, int or None):
+    if is_report_safe(report):
+        return SAFE, None
+    for directed_report in report, -report:
+        removed_level = level_to_dampen(directed_report)
+        if removed_level is not None:
+            return DAMPENED, removed_level
+    return UNSAFE, None
+
+
+# One of the two levels of the first bad step has to be removed, any other removal leaves that step in the report
+def level_to_dampen(report: numpy.array) -> int or None:
+    for i in range(0, len(report) - 1):
+        if 0 < report[i + 1] - report[i] <= 3:
+            continue
+        for removed_level in i + 1, i:
+            if is_report_ascending_and_safe(numpy.delete(report, removed_level)):
+                return removed_level
+        return None
+    return None
+
+
+# Classifies the reports one line at a time, so only one report is in memory however long the log is. Yields the line
+# index, classification and removed level of every report and keeps count of the classifications in totals.
+def stream_report_safety(lines, totals: dict[str, int]):
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        classification, removed_level = classify_report(numpy.array(list(map(int, line.split()))))
+        totals[classification] = totals.get(classification, 0) + 1
+        yield index, classification, removed_level
+
+
+def solve_part1and2_streaming(input_file: str) -> (int, int):
+    totals = {}
+    with open(input_file, 'r') as file:
+        for _ in stream_report_safety(file, totals):
+            pass
+    return totals.get(SAFE, 0), totals.get(SAFE, 0) + totals.get(DAMPENED, 0)
+
+
+def print_report_safety(lines):
+    totals = {}
+    for index, classification, removed_level in stream_report_safety(lines, totals):
+        print(f'{index + 1}: {classification}' + ('' if removed_level is None else f' (remove level {removed_level})'))
+    print(f'Safe: {totals.get(SAFE, 0)}, safe with dampener: {totals.get(DAMPENED, 0)}, '
+          f'unsafe: {totals.get(UNSAFE, 0)}')
+
+
+# Packs the reports into the rows of a matrix, padded with zeros after the last level of every report.
+def pack_reports(reports: list[numpy.array]) -> (numpy.array, numpy.array):
+    lengths = numpy.fromiter(map(len, reports), dtype=numpy.int64, count=len(reports))
+    levels = numpy.zeros((len(reports), lengths.max(initial=0)), dtype=numpy.int64)
+    if len(reports) > 0:
+        levels[numpy.arange(levels.shape[1]) < lengths[:, None]] = numpy.concatenate(reports)
+    return levels, lengths
+
+
+def safe_reports_mask(levels: numpy.array, lengths: numpy.array, dampener: bool = False) -> numpy.array:
+    return ascending_safe_reports_mask(levels, lengths, dampener) | ascending_safe_reports_mask(-levels, lengths,
+                                                                                                dampener)
+
+
+# Checks all reports at once. Removing level r leaves the steps before level r - 1 and after level r + 1 unchanged and
+# replaces the two steps around level r by the step from level r - 1 to level r + 1, so every single-removal variant
+# is checked with prefix and suffix ands of the step checks instead of building the variants.
+def ascending_safe_reports_mask(levels: numpy.array, lengths: numpy.array, dampener: bool = False) -> numpy.array:
+    n_reports, width = levels.shape
+    steps = numpy.diff(levels, axis=1)
+    # Steps into the padding are counted as good
+    good = ((steps >= 1) & (steps <= 3)) | (numpy.arange(width - 1) >= lengths[:, None] - 1)
+    safe = good.all(axis=1)
+    if not dampener or width < 2:
+        return safe
+    # good_before[:, k] tells whether steps 0 to k - 1 are good, good_from[:, k] whether steps k and up are
+    good_before = numpy.ones((n_reports, width), dtype=bool)
+    good_before[:, 1:] = numpy.logical_and.accumulate(good, axis=1)
+    good_from = numpy.ones((n_reports, width), dtype=bool)
+    good_from[:, :-1] = numpy.logical_and.accumulate(good[:, ::-1], axis=1)[:, ::-1]
+    removed = numpy.arange(width)
+    variant_safe = good_before[:, numpy.maximum(removed - 1, 0)]
+    variant_safe[:, :-1] &= good_from[:, 1:]
+    bridges = levels[:, 2:] - levels[:, :-2]
+    variant_safe[:, 1:-1] &= ((bridges >= 1) & (bridges <= 3)) | (removed[1:-1] >= lengths[:, None] - 1)
+    return safe | variant_safe.any(axis=1)
+
+
+def count_safe_reports(reports: list[numpy.array], dampener: bool | int = False) -> int:
+    if dampener > 1:
+        return sum(1 for report in reports if min_removals_to_safe(report) <= dampener)
+    return int(safe_reports_mask(*pack_reports(reports), dampener).sum())
+
+
 def solve_part1(input_file: str) -> int:
-    reports = read_input(input_file)
-    return list(map(is_report_safe, reports)).count(True)
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    reports = parse_input(buffer)
+    return map_reduce(reports, count_safe_reports, MIN_PARALLEL_SIZE)
 
 
 def solve_part2(input_file: str) -> int:
-    reports = read_input(input_file)
-    return list(map(lambda r: is_report_safe(r, True), reports)).count(True)
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    reports = parse_input(buffer)
+    return map_reduce(reports, functools.partial(count_safe_reports, dampener=True), MIN_PARALLEL_SIZE)
 
 
 def solve_part(part: int) -> int:
@@ -58,9 +203,26 @@ def solve_part(part: int) -> int:
     return answer
 
 
-assert_equal(solve_part1('test1.txt'), 2, 'Incorrect answer to example.')
-assert_equal(solve_part2('test1.txt'), 4, 'Incorrect answer to example.')
-
-correct_answers = {1: 660, 2: 689}
-for p in [1, 2]:
-    assert_equal(solve_part(p), correct_answers[p], f'Incorrect answer to part {p}')
+if __name__ == '__main__':
+    # With a file argument, or - for stdin, the reports are classified one by one instead of checking the answers
+    if len(sys.argv) > 1:
+        if sys.argv[1] == '-':
+            print_report_safety(sys.stdin)
+        else:
+            with open(sys.argv[1], 'r') as report_file:
+                print_report_safety(report_file)
+        sys.exit()
+
+    assert_equal(solve_part1('test1.txt'), 2, 'Incorrect answer to example.')
+    assert_equal(solve_part2('test1.txt'), 4, 'Incorrect answer to example.')
+    assert_equal(map_reduce(read_input('test1.txt'), functools.partial(count_safe_reports, dampener=True),
+                            min_parallel_size=0), 4, 'Incorrect answer to example in parallel.')
+    assert_equal(sum(1 for report in read_input('test1.txt') if is_report_safe(report, dampener=True)), 4,
+                 'Incorrect answer to example report by report.')
+    assert_equal(solve_part1and2_streaming('test1.txt'), (2, 4), 'Incorrect answer to example when streaming.')
+    assert_equal([min_removals_to_safe(report) for report in read_input('test1.txt')], [0, 2, 2, 1, 1, 0],
+                 'Incorrect number of removals for the example.')
+
+    correct_answers = {1: 660, 2: 689}
+    for p in [1, 2]:
+        assert_equal(solve_part(p), correct_answers[p], f'Incorrect answer to part {p}')
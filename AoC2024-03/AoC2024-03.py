@@ -1,52 +1,273 @@
-import regex
+import functools
+import itertools
+import mmap
+import os
+import random
+import re
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy
+import regex
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> str:
-    return open(input_file, 'r').read()
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> str:
+    return buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
 
 
-def parse_mul(line_of_code: str) -> int:
+# The tokens of both parts in one pattern, for the standard re module and the third-party regex module. For a mul the
+# last group that matched is y, for the others the group of the instruction.
+TOKEN_PATTERN = r"mul\((?P<x>\d+),(?P<y>\d+)\)|(?P<do>do\(\))|(?P<dont>don't\(\))"
+TOKEN_REGEXES = {'re': re.compile(TOKEN_PATTERN), 'regex': regex.compile(TOKEN_PATTERN)}
+BYTES_TOKEN_REGEX = re.compile(TOKEN_PATTERN.encode())
+
+
+ENGINES = ['re', 'regex', 'dfa']
+
+
+# Scans the code once and returns the sum of all mul instructions and the sum of the enabled ones
+def scan_code(code: str, engine: str = 're') -> (int, int):
+    if engine == 'dfa':
+        return scan_code_dfa(code)
     sum_of_mul = 0
-    pattern = r"mul\([0-9]+,[0-9]+\)"
-    for mul in regex.findall(pattern, line_of_code):
-        x, y = regex.findall(r"[0-9]+", mul)
-        sum_of_mul += int(x) * int(y)
-    return sum_of_mul
+    sum_of_enabled_mul = 0
+    mul_enabled = True
+    for match in TOKEN_REGEXES[engine].finditer(code):
+        token = match.lastgroup
+        if token == 'y':
+            product = int(match['x']) * int(match['y'])
+            sum_of_mul += product
+            if mul_enabled:
+                sum_of_enabled_mul += product
+        else:
+            mul_enabled = token == 'do'
+    return sum_of_mul, sum_of_enabled_mul
+
+
+# What the DFA scanner does on entering a state
+NO_ACTION, FIRST_X_DIGIT, X_DIGIT, FIRST_Y_DIGIT, Y_DIGIT, MUL, DO, DONT = range(8)
+
+
+# Builds the transition table of a DFA recognising mul(x,y) with operands of 1 to max_digits digits (any number of
+# digits for None, the grammar of TOKEN_PATTERN), do() and don't(). State 0 is the start state. No token contains the
+# first letter of a token after its own first letter, so on an unexpected byte the scanner can always continue as if
+# the byte was read in the start state.
+@functools.cache
+def dfa_tables(max_digits: int or None = None) -> (numpy.array, numpy.array):
+    names = ['']
+    actions = [NO_ACTION]
+    edges = {}
+
+    def add_state(name: str, action: int = NO_ACTION) -> int:
+        names.append(name)
+        actions.append(action)
+        return len(names) - 1
 
+    def add_word(state: int, word: str, last_action: int = NO_ACTION) -> int:
+        for index, character in enumerate(word):
+            next_state = add_state(names[state] + character, last_action if index == len(word) - 1 else NO_ACTION)
+            edges[state, ord(character)] = next_state
+            state = next_state
+        return state
 
-def parse_mul_and_do(line_of_code: str) -> int:
+    def add_number(state: int, first_action: int, action: int) -> list[int]:
+        number_states = []
+        for n_digits in range(1, 3 if max_digits is None else max_digits + 1):
+            number_states.append(add_state(names[state] + 'd' * n_digits, first_action if n_digits == 1 else action))
+        for from_state, to_state in zip([state] + number_states, number_states):
+            for digit in b'0123456789':
+                edges[from_state, digit] = to_state
+        if max_digits is None:
+            for digit in b'0123456789':
+                edges[number_states[-1], digit] = number_states[-1]
+        return number_states
+
+    x_states = add_number(add_word(0, 'mul('), FIRST_X_DIGIT, X_DIGIT)
+    comma_state = add_state(names[x_states[0]] + ',')
+    for x_state in x_states:
+        edges[x_state, ord(',')] = comma_state
+    mul_state = add_state('mul(x,y)', MUL)
+    for y_state in add_number(comma_state, FIRST_Y_DIGIT, Y_DIGIT):
+        edges[y_state, ord(')')] = mul_state
+    do_state = add_word(0, 'do')
+    add_word(do_state, '()', DO)
+    add_word(do_state, "n't()", DONT)
+
+    table = numpy.zeros((len(names), 256), dtype=numpy.uint8)
+    for (state, byte), next_state in edges.items():
+        if state == 0:
+            table[:, byte] = next_state
+    for (state, byte), next_state in edges.items():
+        table[state, byte] = next_state
+    return table, numpy.array(actions, dtype=numpy.uint8)
+
+
+# Runs the DFA over the raw bytes and builds the operands from the digits as they are read. The table is indexed as
+# nested lists, which is much faster from a Python loop than indexing the NumPy arrays.
+def scan_code_dfa(code: str | bytes | memoryview | numpy.ndarray, max_digits: int or None = None) -> (int, int):
+    table, actions = dfa_tables(max_digits)
+    table = table.tolist()
+    actions = actions.tolist()
+    data = code.encode() if isinstance(code, str) else memoryview(code).cast('B')
     sum_of_mul = 0
+    sum_of_enabled_mul = 0
     mul_enabled = True
-    # regex.findall returns a list of all matches.
-    # Each match is a list of the match of each group in the matching pattern.
-    for match in regex.findall(r"(mul\(\d+,\d+\))|(do\(\))|(don't\(\))", line_of_code):
-        if len(match[0]) > 0:
+    x = y = 0
+    state = 0
+    for byte in data:
+        state = table[state][byte]
+        action = actions[state]
+        if action == NO_ACTION:
+            continue
+        elif action == X_DIGIT:
+            x = 10 * x + byte - 48
+        elif action == Y_DIGIT:
+            y = 10 * y + byte - 48
+        elif action == FIRST_X_DIGIT:
+            x = byte - 48
+        elif action == FIRST_Y_DIGIT:
+            y = byte - 48
+        elif action == MUL:
+            sum_of_mul += x * y
             if mul_enabled:
-                mul_match = regex.findall(r'mul\((\d+),(\d+)\)', match[0])
-                x, y = mul_match[0]
-                sum_of_mul += int(x) * int(y)
-        elif len(match[1]) > 0:
-            mul_enabled = True
-        elif len(match[2]) > 0:
-            mul_enabled = False
+                sum_of_enabled_mul += x * y
+        else:
+            mul_enabled = action == DO
+    return sum_of_mul, sum_of_enabled_mul
+
+
+def parse_mul(line_of_code: str, engine: str = 're') -> int:
+    return scan_code(line_of_code, engine)[0]
+
+
+def parse_mul_and_do(line_of_code: str, engine: str = 're') -> int:
+    return scan_code(line_of_code, engine)[1]
+
+
+# The tokens starting between start and end. No token can start inside another token, so scanning from the start of a
+# chunk finds the same tokens as scanning the whole file. The scan stops at the end of the chunk, after which only a
+# token that straddles the boundary is left. The first letter of a token appears nowhere else in it, so such a token
+# starts at the last m or d of the chunk.
+def chunk_matches(memory: mmap.mmap, start: int, end: int):
+    last_end = start
+    for match in BYTES_TOKEN_REGEX.finditer(memory, start, end):
+        last_end = match.end()
+        yield match
+    last_token_start = max(memory.rfind(b'm', last_end, end), memory.rfind(b'd', last_end, end))
+    if last_token_start >= 0:
+        match = BYTES_TOKEN_REGEX.match(memory, last_token_start)
+        if match is not None:
+            yield match
+
+
+# Large files are memory-mapped and scanned in chunks by a process pool. A chunk owns the tokens that start inside it.
+# Each chunk is summarised as (sum of mul, sum of enabled mul if mul is enabled at the start of the chunk, the same if
+# it is disabled at the start, the enabled state after the last do() or don't() in the chunk or None without one).
+def scan_chunk(input_file: str, start: int, end: int) -> (int, int, int, bool or None):
+    sums = [0, 0, 0]
+    mul_enabled = [True, False]
+    final_state = None
+    with open(input_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+        for match in chunk_matches(memory, start, end):
+            token = match.lastgroup
+            if token == 'y':
+                product = int(match['x']) * int(match['y'])
+                sums[0] += product
+                for state, enabled in enumerate(mul_enabled):
+                    if enabled:
+                        sums[1 + state] += product
+            else:
+                final_state = token == 'do'
+                mul_enabled = [final_state, final_state]
+    return sums[0], sums[1], sums[2], final_state
+
+
+def combine_summaries(left: (int, int, int, bool or None),
+                      right: (int, int, int, bool or None)) -> (int, int, int, bool or None):
+    sums = [left[0] + right[0]]
+    for state, left_sum in (True, left[1]), (False, left[2]):
+        state_after_left = state if left[3] is None else left[3]
+        sums.append(left_sum + (right[1] if state_after_left else right[2]))
+    return sums[0], sums[1], sums[2], left[3] if right[3] is None else right[3]
+
+
+def solve_part1and2_parallel(input_file: str, chunk_size: int = 1 << 24, processes: int = None) -> (int, int):
+    file_size = os.path.getsize(input_file)
+    starts = range(0, file_size, chunk_size)
+    ends = [min(start + chunk_size, file_size) for start in starts]
+    with ProcessPoolExecutor(processes) as executor:
+        summaries = executor.map(scan_chunk, itertools.repeat(input_file), starts, ends)
+        summary = functools.reduce(combine_summaries, summaries, (0, 0, 0, None))
+    return summary[0], summary[1]
+
+
+# Random corrupted memory of about n_bytes characters, mixing valid instructions with near misses and noise
+def corrupted_memory(n_bytes: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    fragments = ['mul(', ',', ')', 'do()', "don't()", 'mul[', 'mul ( 2,4 )', '%&!@^*', 'from()', 'select<', 'why()']
+    pieces = []
+    size = 0
+    while size < n_bytes:
+        if rng.random() < 0.3:
+            piece = f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})'
         else:
-            raise Exception("Unknown match from regex.")
-    return sum_of_mul
+            piece = rng.choice(fragments) + str(rng.randint(0, 9999)) * (rng.random() < 0.2)
+        pieces.append(piece)
+        size += len(piece)
+    return ''.join(pieces)
+
+
+def benchmark_engines(n_bytes: int = 1 << 25, engines: list[str] = None) -> dict[str, float]:
+    code = corrupted_memory(n_bytes)
+    durations = {}
+    answers = set()
+    for engine in ENGINES if engines is None else engines:
+        duration = time.perf_counter()
+        answers.add(scan_code(code, engine))
+        durations[engine] = time.perf_counter() - duration
+        print(f'{engine}: {len(code) / durations[engine] / 1e6:.1f} MB/s')
+    if len(answers) != 1:
+        raise Exception(f'The engines do not agree: {answers}')
+    return durations
 
 
 def solve_part1(input_file: str) -> int:
-    code = read_input(input_file)
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    code = parse_input(buffer)
     return parse_mul(code)
 
 
 def solve_part2(input_file: str) -> int:
-    code = read_input(input_file)
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    code = parse_input(buffer)
     return parse_mul_and_do(code)
 
 
+def solve_part1and2(input_file: str) -> (int, int):
+    return solve_part1and2_from_buffer(read_file(input_file))
+
+
+def solve_part1and2_from_buffer(buffer: str | bytes | memoryview) -> (int, int):
+    return scan_code(parse_input(buffer))
+
+
 def solve_part(part: int) -> int:
     if not 0 < part <= 2:
         raise Exception("Part must be either 1 or 2.")
@@ -57,11 +278,23 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 183380722, 2: 82733683}
-assert_equal(solve_part1('test1.txt'), 161, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test2.txt'), 48, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--benchmark']:
+        benchmark_engines()
+        sys.exit()
+
+    correct_answers = {1: 183380722, 2: 82733683}
+    assert_equal(solve_part1('test1.txt'), 161, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test2.txt'), 48, 'Incorrect answer to example.')
+    assert_equal(solve_part1and2('test2.txt'), (161, 48), 'Incorrect answer to example.')
+    assert_equal(scan_code(read_input('test2.txt'), 'regex'), (161, 48), 'Incorrect answer to example with regex.')
+    assert_equal(scan_code(read_input('test2.txt'), 'dfa'), (161, 48), 'Incorrect answer to example with the DFA.')
+    for test_engine in ENGINES:
+        assert_equal(scan_code('mul(1234,5)', test_engine), (6170, 6170), f'Incorrect long operand with {test_engine}.')
+    assert_equal(solve_part1and2_parallel('test2.txt', chunk_size=7), (161, 48),
+                 'Incorrect answer to example in chunks.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
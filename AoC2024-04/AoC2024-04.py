@@ -1,10 +1,29 @@
 import time
+from collections import deque
 
+import numpy
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> list[list[str]]:
-    return [[character for character in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[list[str]]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [[character for character in line.rstrip()] for line in text.splitlines()]
+
+
+# The letters as a uint8 array with one row per line of the word search
+def parse_letter_grid(buffer: str | bytes | memoryview) -> numpy.array:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    lines = [line.rstrip() for line in text.splitlines()]
+    return numpy.frombuffer(''.join(lines).encode(), dtype=numpy.uint8).reshape(len(lines), -1)
 
 
 class Matrix:
@@ -136,14 +155,178 @@ def search_location_for_x(word_search: Matrix, x: int, y: int, sequence: list) -
     return x_found
 
 
+# Marks every cell where the word starts in the given direction. For each letter of the word the grid is compared with
+# a shifted view of itself, so every anchor is checked at once.
+def word_anchors(grid: numpy.array, word: str, direction: (int, int)) -> numpy.array:
+    n_rows, n_cols = grid.shape
+    reach_x = (len(word) - 1) * direction[0]
+    reach_y = (len(word) - 1) * direction[1]
+    x_range = max(0, -reach_x), n_cols - max(0, reach_x)
+    y_range = max(0, -reach_y), n_rows - max(0, reach_y)
+    anchors = numpy.zeros(grid.shape, dtype=bool)
+    if x_range[0] >= x_range[1] or y_range[0] >= y_range[1]:
+        return anchors
+    found = numpy.ones((y_range[1] - y_range[0], x_range[1] - x_range[0]), dtype=bool)
+    for index, letter in enumerate(word.encode()):
+        x = x_range[0] + index * direction[0]
+        y = y_range[0] + index * direction[1]
+        found &= grid[y:y + found.shape[0], x:x + found.shape[1]] == letter
+    anchors[y_range[0]:y_range[1], x_range[0]:x_range[1]] = found
+    return anchors
+
+
+def count_word(grid: numpy.array, word: str, directions: list[(int, int)]) -> int:
+    return sum(int(word_anchors(grid, word, direction).sum()) for direction in directions)
+
+
+def count_x(grid: numpy.array, word: str) -> int:
+    return int(x_squares(grid, word).sum())
+
+
+# Counts the words crossing each other diagonally in a len(word) by len(word) square, identified by its top left
+# corner. One diagonal runs down to the right from the corner and the other down to the left from the top right.
+def x_squares(grid: numpy.array, word: str) -> numpy.array:
+    width = len(word) - 1
+    n_rows, n_cols = grid.shape
+    if n_cols <= width:
+        return numpy.zeros((n_rows, 0), dtype=int)
+    down_right = word_anchors(grid, word, (1, 1)).astype(int) + word_anchors(grid, word[::-1], (1, 1))
+    down_left = word_anchors(grid, word, (-1, 1)) | word_anchors(grid, word[::-1], (-1, 1))
+    return down_right[:, :n_cols - width] * down_left[:, width:]
+
+
+# Reads the grid in bands of band_rows rows followed by the overlap next rows, and yields each band with the number
+# of rows it owns. Only the rows of one band are in memory at a time.
+def read_bands(input_file: str, band_rows: int, overlap: int):
+    rows = []
+    with open(input_file, 'rb') as file:
+        for line in file:
+            line = line.rstrip()
+            if not line:
+                continue
+            rows.append(numpy.frombuffer(line, dtype=numpy.uint8))
+            if len(rows) == band_rows + overlap:
+                yield numpy.stack(rows), band_rows
+                rows = rows[band_rows:]
+    if rows:
+        yield numpy.stack(rows), len(rows)
+
+
+# Counts the occurrences whose top row is one of the first n_owned_rows rows of the band. With an overlap of
+# len(word) - 1 rows every such occurrence lies completely inside the band, and every occurrence has its top row in
+# exactly one band.
+def count_word_in_band(band: numpy.array, n_owned_rows: int, word: str, directions: list[(int, int)]) -> int:
+    words_found = 0
+    for direction in directions:
+        found_per_row = word_anchors(band, word, direction).sum(axis=1)
+        # Words going up start below their top row
+        top_offset = (len(word) - 1) * min(direction[1], 0)
+        words_found += int(found_per_row[-top_offset:n_owned_rows - top_offset].sum())
+    return words_found
+
+
+def solve_part1and2_banded(input_file: str, word: str = 'XMAS', x_word: str = 'MAS',
+                           band_rows: int = 1024) -> (int, int):
+    words_found = 0
+    x_found = 0
+    for band, n_owned_rows in read_bands(input_file, band_rows, max(len(word), len(x_word)) - 1):
+        words_found += count_word_in_band(band, n_owned_rows, word, Matrix.all_directions())
+        x_found += int(x_squares(band, x_word)[:n_owned_rows].sum())
+    return words_found, x_found
+
+
+# Aho-Corasick automaton finding all occurrences of many words in one pass over a text
+class WordAutomaton:
+    def __init__(self, words: list[str]):
+        self.words = list(dict.fromkeys(words))
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail = [0]
+        # Indices of the words ending in each state, including those ending in its fail states
+        self._output: list[tuple] = [()]
+        for word_index, word in enumerate(self.words):
+            state = 0
+            for character in word:
+                if character not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][character] = len(self._goto) - 1
+                state = self._goto[state][character]
+            self._output[state] += (word_index,)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+                if state != 0:
+                    fail = self._fail[state]
+                    while fail and character not in self._goto[fail]:
+                        fail = self._fail[fail]
+                    self._fail[next_state] = self._goto[fail].get(character, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    # Yields the index in the text of the last character and the index of the word for every occurrence
+    def matches(self, text: str):
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, character in enumerate(text):
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            for word_index in output[state]:
+                yield index, word_index
+
+
+# Every line through the grid in each of the 8 directions, with the position of its first letter and its direction
+def grid_lines(grid: numpy.array):
+    n_rows, n_cols = grid.shape
+    for direction in Matrix.all_directions():
+        dx, dy = direction
+        starts = set()
+        if dy != 0:
+            starts.update((x, 0 if dy > 0 else n_rows - 1) for x in range(n_cols))
+        if dx != 0:
+            starts.update((0 if dx > 0 else n_cols - 1, y) for y in range(n_rows))
+        for x, y in sorted(starts):
+            length = min(n_cols - x if dx > 0 else x + 1 if dx < 0 else n_cols + n_rows,
+                         n_rows - y if dy > 0 else y + 1 if dy < 0 else n_cols + n_rows)
+            steps = numpy.arange(length)
+            yield grid[y + steps * dy, x + steps * dx].tobytes().decode(), (x, y), direction
+
+
+# Counts every word in the dictionary in a single pass over all lines of the grid, so the cost hardly depends on the
+# number of words. With positions, the start and direction of every occurrence is returned as well.
+def search_words(grid: numpy.array, words: list[str], positions: bool = False) -> dict[str, int] or (
+        dict[str, int], dict[str, list[((int, int), (int, int))]]):
+    automaton = WordAutomaton(words)
+    counts = [0] * len(automaton.words)
+    found = {word: [] for word in automaton.words}
+    for line, (x, y), (dx, dy) in grid_lines(grid):
+        for index, word_index in automaton.matches(line):
+            counts[word_index] += 1
+            if positions:
+                start = index - len(automaton.words[word_index]) + 1
+                found[automaton.words[word_index]].append(((x + start * dx, y + start * dy), (dx, dy)))
+    counts = dict(zip(automaton.words, counts))
+    return (counts, found) if positions else counts
+
+
 def solve_part1(input_file: str) -> int:
-    word_search = Matrix(read_input(input_file))
-    return search_for_sequence(word_search, ['X', 'M', 'A', 'S'], word_search.all_directions())
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    grid = parse_letter_grid(buffer)
+    return count_word(grid, 'XMAS', Matrix.all_directions())
 
 
 def solve_part2(input_file: str) -> int:
-    word_search = Matrix(read_input(input_file))
-    return search_for_x(word_search, ['M', 'A', 'S'])
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    grid = parse_letter_grid(buffer)
+    return count_x(grid, 'MAS')
 
 
 def solve_part(part: int) -> int:
@@ -156,11 +339,19 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 2401, 2: 1822}
-assert_equal(solve_part1('test1.txt'), 18, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test1.txt'), 9, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
-
-for p in [1, 2]:
-    solve_part(p)
+if __name__ == '__main__':
+    correct_answers = {1: 2401, 2: 1822}
+    assert_equal(solve_part1('test1.txt'), 18, 'Incorrect answer to example.')
+    assert_equal(search_for_sequence(Matrix(read_input('test1.txt')), ['X', 'M', 'A', 'S'], Matrix.all_directions()),
+                 18, 'Incorrect answer to example with the crawler.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(search_words(parse_letter_grid(read_file('test1.txt')), ['XMAS', 'SAMX', 'MAS']),
+                 {'XMAS': 18, 'SAMX': 18, 'MAS': 38}, 'Incorrect answer to example with many words.')
+    assert_equal(solve_part2('test1.txt'), 9, 'Incorrect answer to example.')
+    assert_equal(solve_part1and2_banded('test1.txt', band_rows=2), (18, 9), 'Incorrect answer to example in bands.')
+    assert_equal(search_for_x(Matrix(read_input('test1.txt')), ['M', 'A', 'S']), 9,
+                 'Incorrect answer to example with the crawler.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+
+    for p in [1, 2]:
+        solve_part(p)
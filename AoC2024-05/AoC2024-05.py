@@ -1,20 +1,30 @@
 import time
+from collections import deque
 
 from numpy.testing import assert_equal
 
 
-def read_input(input_file: str) -> (dict[int, list[int]], list[int]):
+def read_file(input_file: str) -> str:
     with open(input_file, 'r') as file:
-        rules, books = file.read().split('\n\n')
-        rules = [[int(page) for page in rule.split('|')] for rule in rules.splitlines()]
-        books = [[int(page) for page in page_list.split(',')] for page_list in books.splitlines()]
-        rule_dict = {}
-        for before, after in rules:
-            if before not in rule_dict:
-                rule_dict[before] = [after]
-            else:
-                rule_dict[before].append(after)
-        return rule_dict, books
+        return file.read()
+
+
+def read_input(input_file: str) -> (dict[int, list[int]], list[int]):
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (dict[int, list[int]], list[int]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    rules, books = text.split('\n\n')
+    rules = [[int(page) for page in rule.split('|')] for rule in rules.splitlines()]
+    books = [[int(page) for page in page_list.split(',')] for page_list in books.splitlines()]
+    rule_dict = {}
+    for before, after in rules:
+        if before not in rule_dict:
+            rule_dict[before] = [after]
+        else:
+            rule_dict[before].append(after)
+    return rule_dict, books
 
 
 def check_page_list(page_list: list[int], rules: dict[int, list[int]]) -> (bool, int):
@@ -47,12 +57,145 @@ def fixed_middle_page(page_list: list[int], rules: dict[int, list[int]]) -> int:
     return reversed_fixed_page_list[len(reversed_fixed_page_list) // 2]
 
 
+# The rules compiled once into bitmasks, bit n of the mask of a page is set when page n has to come after it (or before
+# it for the earlier pages). A book is then checked in one pass keeping a mask of the pages seen so far.
+class PageOrdering:
+    def __init__(self, rules: dict[int, list[int]]):
+        self._later_pages: dict[int, int] = {}
+        self._earlier_pages: dict[int, int] = {}
+        for before, pages_after in rules.items():
+            for after in pages_after:
+                self.add_rule(before, after)
+
+    def add_rule(self, before: int, after: int):
+        self._later_pages[before] = self._later_pages.get(before, 0) | 1 << after
+        self._earlier_pages[after] = self._earlier_pages.get(after, 0) | 1 << before
+
+    def remove_rule(self, before: int, after: int):
+        self._later_pages[before] = self._later_pages.get(before, 0) & ~(1 << after)
+        self._earlier_pages[after] = self._earlier_pages.get(after, 0) & ~(1 << before)
+
+    def is_ordered(self, page_list: list[int]) -> bool:
+        pages_seen = 0
+        for page in page_list:
+            if self._later_pages.get(page, 0) & pages_seen:
+                return False
+            pages_seen |= 1 << page
+        return True
+
+    # Kahn's algorithm on the rules between the pages of the book
+    def fixed(self, page_list: list[int]) -> list[int]:
+        book = 0
+        for page in page_list:
+            book |= 1 << page
+        n_earlier = {page: (self._earlier_pages.get(page, 0) & book).bit_count() for page in page_list}
+        ready = deque(page for page in page_list if n_earlier[page] == 0)
+        fixed_page_list = []
+        while ready:
+            page = ready.popleft()
+            fixed_page_list.append(page)
+            later_pages = self._later_pages.get(page, 0) & book
+            for later_page in page_list:
+                if later_pages >> later_page & 1:
+                    n_earlier[later_page] -= 1
+                    if n_earlier[later_page] == 0:
+                        ready.append(later_page)
+        if len(fixed_page_list) != len(page_list):
+            raise Exception(f'The rules for the pages {page_list} contain a cycle.')
+        return fixed_page_list
+
+    def check_page_list(self, page_list: list[int]) -> (bool, int):
+        if self.is_ordered(page_list):
+            return True, page_list[len(page_list) // 2]
+        fixed_page_list = self.fixed(page_list)
+        return False, fixed_page_list[len(fixed_page_list) // 2]
+
+
+# Keeps the middle page sums up to date while rules and books are added and removed. A rule can only change the
+# outcome for books containing both of its pages, which are found through an index from each page to its books.
+class PrintQueue:
+    def __init__(self, rules: dict[int, list[int]], page_lists: list[list[int]]):
+        self._rules = {(before, after) for before, pages_after in rules.items() for after in pages_after}
+        self._ordering = PageOrdering(rules)
+        self._books: dict[int, list[int]] = {}
+        self._books_by_page: dict[int, set[int]] = {}
+        self._results: dict[int, (bool, int)] = {}
+        self._next_book_id = 0
+        self.correct_middle_page_sum = 0
+        self.fixed_middle_page_sum = 0
+        for page_list in page_lists:
+            self.add_book(page_list)
+
+    @staticmethod
+    def from_buffer(buffer: str | bytes | memoryview):
+        return PrintQueue(*parse_input(buffer))
+
+    def middle_page_sums(self) -> (int, int):
+        return self.correct_middle_page_sum, self.fixed_middle_page_sum
+
+    def _count(self, book_id: int, sign: int):
+        correctly_ordered, middle_page = self._results[book_id]
+        if correctly_ordered:
+            self.correct_middle_page_sum += sign * middle_page
+        else:
+            self.fixed_middle_page_sum += sign * middle_page
+
+    def add_book(self, page_list: list[int]) -> int:
+        book_id = self._next_book_id
+        self._next_book_id += 1
+        self._results[book_id] = self._ordering.check_page_list(page_list)
+        self._books[book_id] = list(page_list)
+        for page in page_list:
+            self._books_by_page.setdefault(page, set()).add(book_id)
+        self._count(book_id, 1)
+        return book_id
+
+    def remove_book(self, book_id: int):
+        self._count(book_id, -1)
+        for page in self._books.pop(book_id):
+            self._books_by_page[page].discard(book_id)
+        del self._results[book_id]
+
+    # A new rule can make a book impossible to order, then the rule is taken back out before raising
+    def add_rule(self, before: int, after: int):
+        if (before, after) in self._rules:
+            return
+        self._rules.add((before, after))
+        self._ordering.add_rule(before, after)
+        try:
+            self._revalidate(before, after)
+        except Exception:
+            self._rules.remove((before, after))
+            self._ordering.remove_rule(before, after)
+            raise
+
+    def remove_rule(self, before: int, after: int):
+        if (before, after) in self._rules:
+            self._rules.remove((before, after))
+            self._ordering.remove_rule(before, after)
+            self._revalidate(before, after)
+
+    # All affected books are checked before any result is replaced, so the sums are never left half updated
+    def _revalidate(self, page_a: int, page_b: int):
+        affected_books = self._books_by_page.get(page_a, set()) & self._books_by_page.get(page_b, set())
+        results = {book_id: self._ordering.check_page_list(self._books[book_id]) for book_id in affected_books}
+        for book_id, result in results.items():
+            self._count(book_id, -1)
+            self._results[book_id] = result
+            self._count(book_id, 1)
+
+
 def solve_part1and2(input_file: str) -> (int, int):
-    rules, page_lists = read_input(input_file)
+    return solve_part1and2_from_buffer(read_file(input_file))
+
+
+def solve_part1and2_from_buffer(buffer: str | bytes | memoryview) -> (int, int):
+    rules, page_lists = parse_input(buffer)
+    ordering = PageOrdering(rules)
     correct_middle_page_sum = 0
     fixed_middle_page_sum = 0
     for page_list in page_lists:
-        correctly_ordered, middle_page = check_page_list(page_list, rules)
+        correctly_ordered, middle_page = ordering.check_page_list(page_list)
         if correctly_ordered:
             correct_middle_page_sum += middle_page
         else:
@@ -68,8 +211,20 @@ def solve_parts() -> (int, int):
     return answer
 
 
-correct_answers = (4689, 6336)
-assert_equal(solve_part1and2('test1.txt'), (143, 123), 'Incorrect answer to example.')
-assert_equal(solve_part1and2('input.txt'), correct_answers, f'Incorrect answer to part 1')
-
-solve_parts()
+if __name__ == '__main__':
+    correct_answers = (4689, 6336)
+    assert_equal(solve_part1and2('test1.txt'), (143, 123), 'Incorrect answer to example.')
+    test_rules, test_page_lists = read_input('test1.txt')
+    assert_equal([check_page_list(page_list, test_rules) for page_list in test_page_lists],
+                 [PageOrdering(test_rules).check_page_list(page_list) for page_list in test_page_lists],
+                 'Incorrect check of the example with the page ordering.')
+    print_queue = PrintQueue(test_rules, test_page_lists)
+    print_queue.remove_rule(47, 53)
+    assert_equal(print_queue.middle_page_sums(), (143, 123), 'Incorrect sums after removing a rule.')
+    print_queue.remove_rule(97, 75)
+    assert_equal(print_queue.middle_page_sums(), (143 + 47, 123 - 47), 'Incorrect sums after removing a rule.')
+    print_queue.add_rule(97, 75)
+    assert_equal(print_queue.middle_page_sums(), (143, 123), 'Incorrect sums after adding a rule.')
+    assert_equal(solve_part1and2('input.txt'), correct_answers, f'Incorrect answer to part 1')
+
+    solve_parts()
@@ -1,11 +1,30 @@
+import os
+import sys
+import tempfile
 import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 import numpy
 from numpy.testing import assert_equal
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import Checkpoint, SearchInterrupted  # noqa: E402
+
+
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
 
 def read_input(input_file: str) -> list[list[str]]:
-    return [[character for character in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[list[str]]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [[character for character in line.rstrip()] for line in text.splitlines()]
 
 
 class Matrix:
@@ -127,29 +146,282 @@ def guard_itinerary(patrol_map: Matrix, starting_position: (int, int), starting_
     return itinerary
 
 
-def solve_part1and2(input_file: str) -> (int, int):
-    patrol_map = Matrix(read_input(input_file))
-    starting_position = patrol_map.find('^')
-    original_path = guard_itinerary(patrol_map, starting_position, patrol_map.direction_by_name('Up'))
-    candidate_obstacles = set()
-    for position, direction in original_path:
-        candidate_obstacles.add((position[0], position[1]))
-    candidate_obstacles.remove((starting_position[0], starting_position[1]))
+# Up, right, down and left, so turning right is going to the next direction
+GUARD_DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+# Moves the guard straight from obstacle to obstacle. The obstacles of every row and column are kept in sorted lists,
+# so the next obstacle ahead is found with a binary search. An extra obstacle is given as a parameter instead of being
+# put in the map.
+class JumpMap:
+    def __init__(self, obstacles: numpy.array, start: (int, int)):
+        self.n_rows, self.n_cols = obstacles.shape
+        self._obstacles_in_row = [numpy.flatnonzero(row).tolist() for row in obstacles]
+        self._obstacles_in_col = [numpy.flatnonzero(col).tolist() for col in obstacles.T]
+        self.start = start
+        self._obstacles = obstacles
+
+    @staticmethod
+    def from_patrol_map(patrol_map: list[list[str]]):
+        start = next((row.index('^'), y) for y, row in enumerate(patrol_map) if '^' in row)
+        return JumpMap(numpy.array(patrol_map) == '#', start)
+
+    def obstacles_in_rows(self) -> list[list[int]]:
+        return self._obstacles_in_row
+
+    def obstacles_in_cols(self) -> list[list[int]]:
+        return self._obstacles_in_col
+
+    def is_obstacle(self, position: (int, int)) -> bool:
+        return bool(self._obstacles[position[1], position[0]])
+
+    # The position where the guard stops in front of the next obstacle, or None when the guard leaves the map
+    def next_stop(self, x: int, y: int, direction: int, extra_obstacle: (int, int) = None) -> (int, int) or None:
+        dx, dy = GUARD_DIRECTIONS[direction]
+        if dx == 0:
+            obstacles, position, step = self._obstacles_in_col[x], y, dy
+            extra = None if extra_obstacle is None or extra_obstacle[0] != x else extra_obstacle[1]
+        else:
+            obstacles, position, step = self._obstacles_in_row[y], x, dx
+            extra = None if extra_obstacle is None or extra_obstacle[1] != y else extra_obstacle[0]
+        if step > 0:
+            index = bisect_right(obstacles, position)
+            blocker = obstacles[index] if index < len(obstacles) else None
+            if extra is not None and extra > position and (blocker is None or extra < blocker):
+                blocker = extra
+        else:
+            index = bisect_left(obstacles, position) - 1
+            blocker = obstacles[index] if index >= 0 else None
+            if extra is not None and extra < position and (blocker is None or extra > blocker):
+                blocker = extra
+        if blocker is None:
+            return None
+        return (blocker - step, y) if dx != 0 else (x, blocker - step)
+
+    # Turn states are encoded as integers, the guard is in a loop when it turns at the same place in the same direction
+    # a second time
+    def loops(self, x: int, y: int, direction: int, extra_obstacle: (int, int) = None) -> bool:
+        turn_states = set()
+        while True:
+            stop = self.next_stop(x, y, direction, extra_obstacle)
+            if stop is None:
+                return False
+            x, y = stop
+            direction = (direction + 1) % 4
+            turn_state = (y * self.n_cols + x) << 2 | direction
+            if turn_state in turn_states:
+                return True
+            turn_states.add(turn_state)
+
+    # The cells of the path of the guard in the order of their first visit, each with the position and direction of
+    # the guard just before stepping onto it. The starting position is not included.
+    def first_visits(self) -> list[((int, int), (int, int, int))]:
+        x, y = self.start
+        direction = 0
+        visited = {(x, y)}
+        visits = []
+        turn_states = set()
+        while True:
+            stop = self.next_stop(x, y, direction)
+            dx, dy = GUARD_DIRECTIONS[direction]
+            if stop is None:
+                n_steps = (self.n_cols - 1 - x if dx > 0 else x if dx < 0 else self.n_rows - 1 - y if dy > 0 else y)
+            else:
+                n_steps = abs(stop[0] - x) + abs(stop[1] - y)
+            for _ in range(n_steps):
+                if (x + dx, y + dy) not in visited:
+                    visited.add((x + dx, y + dy))
+                    visits.append(((x + dx, y + dy), (x, y, direction)))
+                x, y = x + dx, y + dy
+            if stop is None:
+                return visits
+            direction = (direction + 1) % 4
+            turn_state = (y * self.n_cols + x) << 2 | direction
+            if turn_state in turn_states:
+                raise Exception('The guard never leaves the map.')
+            turn_states.add(turn_state)
+
+
+# The transitions from every turn state next to an obstacle to the turn state at the next obstacle, built once. An
+# extra obstacle only changes the transitions whose ray crosses it, which start from the turn states on its row or
+# column up to the next obstacle in the other direction. Those few are patched per candidate obstacle, so following the
+# guard costs one lookup per turn instead of one step per cell of the path.
+class TurnGraph:
+    def __init__(self, jump_map: JumpMap):
+        self._jump_map = jump_map
+        self._n_cols = jump_map.n_cols
+        # Indexed by encoded turn state, the encoded next turn state, EXIT when the guard leaves the map or NO_STATE
+        self._next_states = [TurnGraph.NO_STATE] * (jump_map.n_rows * jump_map.n_cols * 4)
+        # The turn states by direction along every row and column, sorted by their position along it
+        self._states_in_row = [[[] for _ in GUARD_DIRECTIONS] for _ in range(jump_map.n_rows)]
+        self._states_in_col = [[[] for _ in GUARD_DIRECTIONS] for _ in range(jump_map.n_cols)]
+        turn_states = set()
+        for y, row in enumerate(jump_map.obstacles_in_rows()):
+            for x in row:
+                for direction, (dx, dy) in enumerate(GUARD_DIRECTIONS):
+                    position = x - dx, y - dy
+                    if 0 <= position[0] < jump_map.n_cols and 0 <= position[1] < jump_map.n_rows and \
+                            not jump_map.is_obstacle(position):
+                        turn_states.add((position[0], position[1], (direction + 1) % 4))
+        for x, y, direction in sorted(turn_states, key=lambda state: (state[1], state[0])):
+            self._next_states[self.encode(x, y, direction)] = self.next_state(x, y, direction)
+            self._states_in_row[y][direction].append(x)
+        for x, y, direction in sorted(turn_states):
+            self._states_in_col[x][direction].append(y)
+
+    NO_STATE = -2
+    EXIT = -1
+
+    def encode(self, x: int, y: int, direction: int) -> int:
+        return (y * self._n_cols + x) << 2 | direction
+
+    def decode(self, turn_state: int) -> (int, int, int):
+        position, direction = turn_state >> 2, turn_state & 3
+        return position % self._n_cols, position // self._n_cols, direction
+
+    def next_state(self, x: int, y: int, direction: int, extra_obstacle: (int, int) = None) -> int:
+        stop = self._jump_map.next_stop(x, y, direction, extra_obstacle)
+        return TurnGraph.EXIT if stop is None else self.encode(stop[0], stop[1], (direction + 1) % 4)
+
+    # The turn states whose ray runs into the extra obstacle now stop in front of it
+    def patched_transitions(self, extra_obstacle: (int, int)) -> dict[int, int]:
+        x, y = extra_obstacle
+        patches = {}
+        for direction, (dx, dy) in enumerate(GUARD_DIRECTIONS):
+            stop_state = self.encode(x - dx, y - dy, (direction + 1) % 4)
+            if dx != 0:
+                states = self._states_in_row[y][direction]
+                obstacles = self._jump_map.obstacles_in_rows()[y]
+                position, size = x, self._jump_map.n_cols
+            else:
+                states = self._states_in_col[x][direction]
+                obstacles = self._jump_map.obstacles_in_cols()[x]
+                position, size = y, self._jump_map.n_rows
+            # The rays reaching the extra obstacle start between it and the previous obstacle behind the guard
+            if dx + dy > 0:
+                index = bisect_left(obstacles, position) - 1
+                first, last = obstacles[index] if index >= 0 else -1, position
+            else:
+                index = bisect_right(obstacles, position)
+                first, last = position, obstacles[index] if index < len(obstacles) else size
+            for state_position in states[bisect_right(states, first):bisect_left(states, last)]:
+                if dx != 0:
+                    state = self.encode(state_position, y, direction)
+                else:
+                    state = self.encode(x, state_position, direction)
+                patches[state] = stop_state
+        return patches
+
+    def loops(self, x: int, y: int, direction: int, extra_obstacle: (int, int)) -> bool:
+        patches = self.patched_transitions(extra_obstacle)
+        next_states = self._next_states
+        turn_states = set()
+        turn_state = self.next_state(x, y, direction, extra_obstacle)
+        while turn_state != TurnGraph.EXIT:
+            if turn_state in turn_states:
+                return True
+            turn_states.add(turn_state)
+            next_turn_state = patches.get(turn_state)
+            if next_turn_state is None:
+                next_turn_state = next_states[turn_state]
+                if next_turn_state == TurnGraph.NO_STATE:
+                    # A turn in front of the extra obstacle that is not in front of any other obstacle
+                    next_turn_state = self.next_state(*self.decode(turn_state), extra_obstacle)
+                    patches[turn_state] = next_turn_state
+            turn_state = next_turn_state
+        return False
+
+
+# The checkpoint holds the index of the next candidate obstacle to try and the loop obstacles found before it
+def solve_part1and2(input_file: str, checkpoint_file: str = None, resume: bool = False,
+                    checkpoint_interval: float = 60.0) -> (int, int):
+    return solve_part1and2_from_buffer(read_file(input_file), checkpoint_file, resume, checkpoint_interval)
+
+
+# An obstacle can only change the path at the cells the guard visits. Each one is tried with the guard starting just
+# before its first visit to the cell, since the path up to there is the same as without the obstacle.
+def solve_part1and2_from_buffer(buffer: str | bytes | memoryview, checkpoint_file: str = None, resume: bool = False,
+                                checkpoint_interval: float = 60.0) -> (int, int):
+    jump_map = JumpMap.from_patrol_map(parse_input(buffer))
+    candidate_obstacles = jump_map.first_visits()
+    checkpoint = None if checkpoint_file is None else Checkpoint(checkpoint_file, checkpoint_interval)
+    loop_obstacles = find_loop_obstacles(TurnGraph(jump_map), candidate_obstacles, checkpoint, resume)
+    return len(candidate_obstacles) + 1, len(loop_obstacles)
+
+
+def find_loop_obstacles(turn_graph: TurnGraph, candidate_obstacles: list[((int, int), (int, int, int))],
+                        checkpoint: Checkpoint = None, resume: bool = False) -> list[(int, int)]:
     loop_obstacles = []
-    tried = set()
-    for index, obstacle in list(enumerate(original_path))[1:]:
-        if obstacle[0] in tried:
-            continue
-        patrol_map[obstacle[0]] = '#'
-        new_path = guard_itinerary(patrol_map, original_path[index - 1][0], original_path[index - 1][1])
-        last_destination_x = new_path[-1][0][0] + new_path[-1][1][0]
-        last_destination_y = new_path[-1][0][1] + new_path[-1][1][1]
-        if patrol_map.is_in_bound((last_destination_x, last_destination_y)):
+    first_index = 0
+    state = checkpoint.load() if checkpoint is not None and resume else None
+    if state is not None:
+        if state['n_candidates'] != len(candidate_obstacles):
+            raise Exception('The checkpoint was not made for this input.')
+        first_index = state['index']
+        loop_obstacles = [(x, y) for x, y in state['loop_obstacles']]
+    for index in range(first_index, len(candidate_obstacles)):
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save(obstacle_search_state(index, candidate_obstacles, loop_obstacles))
+        obstacle, (x, y, direction) = candidate_obstacles[index]
+        if turn_graph.loops(x, y, direction, obstacle):
             loop_obstacles.append(obstacle)
-        patrol_map[obstacle[0]] = '.'
-        tried.add(obstacle[0])
+    if checkpoint is not None:
+        checkpoint.save(obstacle_search_state(len(candidate_obstacles), candidate_obstacles, loop_obstacles))
+    return loop_obstacles
+
+
+def obstacle_search_state(index: int, candidate_obstacles: list[((int, int), (int, int, int))],
+                          loop_obstacles: list[(int, int)]) -> dict:
+    return {'n_candidates': len(candidate_obstacles), 'index': index,
+            'loop_obstacles': [[x, y] for x, y in loop_obstacles]}
+
+
+# The turn graph of the process pool workers, set up once per worker from the obstacles in shared memory
+_worker_turn_graph: TurnGraph = None
 
-    return len(candidate_obstacles) + 1, len(loop_obstacles)
+
+def init_loop_worker(shared_memory_name: str, shape: (int, int), start: (int, int)):
+    global _worker_turn_graph
+    memory = shared_memory.SharedMemory(shared_memory_name)
+    try:
+        # Copied out of the shared memory, which is unmapped when closed while the jump map keeps the obstacles
+        obstacles = numpy.ndarray(shape, dtype=bool, buffer=memory.buf).copy()
+        _worker_turn_graph = TurnGraph(JumpMap(obstacles, start))
+    finally:
+        memory.close()
+
+
+def count_loop_obstacles(candidate_obstacles: list[((int, int), (int, int, int))]) -> int:
+    return sum(1 for obstacle, (x, y, direction) in candidate_obstacles if
+               _worker_turn_graph.loops(x, y, direction, obstacle))
+
+
+def solve_part1and2_parallel(input_file: str, processes: int = None, chunk_size: int = None) -> (int, int):
+    return solve_part1and2_parallel_from_buffer(read_file(input_file), processes, chunk_size)
+
+
+# The obstacles are shared with the workers through shared memory instead of being pickled for every task, and the
+# candidate obstacles are sent to the workers in chunks, each with the state to start the guard from.
+def solve_part1and2_parallel_from_buffer(buffer: str | bytes | memoryview, processes: int = None,
+                                         chunk_size: int = None) -> (int, int):
+    patrol_map = parse_input(buffer)
+    jump_map = JumpMap.from_patrol_map(patrol_map)
+    candidate_obstacles = jump_map.first_visits()
+    obstacles = numpy.array(patrol_map) == '#'
+    processes = os.cpu_count() if processes is None else processes
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(candidate_obstacles) // (4 * processes)))
+    chunks = [candidate_obstacles[start:start + chunk_size] for start in range(0, len(candidate_obstacles), chunk_size)]
+    memory = shared_memory.SharedMemory(create=True, size=max(1, obstacles.nbytes))
+    try:
+        numpy.ndarray(obstacles.shape, dtype=bool, buffer=memory.buf)[:] = obstacles
+        with ProcessPoolExecutor(processes, initializer=init_loop_worker,
+                                 initargs=(memory.name, obstacles.shape, jump_map.start)) as executor:
+            n_loop_obstacles = sum(executor.map(count_loop_obstacles, chunks))
+    finally:
+        memory.close()
+        memory.unlink()
+    return len(candidate_obstacles) + 1, n_loop_obstacles
 
 
 def solve_parts() -> (int, int):
@@ -160,8 +432,27 @@ def solve_parts() -> (int, int):
     return answer
 
 
-correct_answers = [5145, 1523]
-assert_equal(solve_part1and2('test1.txt'), (41, 6), 'Incorrect answer to example.')
-# assert_equal(solve_part1and2('input.txt'), correct_answers, f'Incorrect answer to part 1')
-
-solve_parts()
+if __name__ == '__main__':
+    correct_answers = [5145, 1523]
+    assert_equal(solve_part1and2('test1.txt'), (41, 6), 'Incorrect answer to example.')
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        test_checkpoint_file = os.path.join(temporary_directory, 'checkpoint.json')
+        test_jump_map = JumpMap.from_patrol_map(read_input('test1.txt'))
+        try:
+            find_loop_obstacles(TurnGraph(test_jump_map), test_jump_map.first_visits(),
+                                Checkpoint(test_checkpoint_file, 0, stop_after=21))
+        except SearchInterrupted:
+            pass
+        assert_equal(Checkpoint(test_checkpoint_file, 0).load()['index'], 20, 'Incorrect interrupted search.')
+        assert_equal(solve_part1and2('test1.txt', test_checkpoint_file, resume=True), (41, 6),
+                     'Incorrect answer to example after resuming.')
+    assert_equal(solve_part1and2_parallel('test1.txt', processes=2), (41, 6),
+                 'Incorrect answer to example in parallel.')
+    assert_equal(solve_part1and2_parallel_from_buffer(read_file('test1.txt').encode(), processes=2), (41, 6),
+                 'Incorrect answer to example in parallel from bytes.')
+    test_path = guard_itinerary(Matrix(read_input('test1.txt')), (4, 6), Matrix.direction_by_name('Up'))
+    assert_equal(len({position for position, direction in test_path}), 41,
+                 'Incorrect answer to example with the crawler.')
+    # assert_equal(solve_part1and2('input.txt'), correct_answers, f'Incorrect answer to part 1')
+
+    solve_parts()
@@ -1,46 +1,151 @@
+import functools
+import os
+import sys
 import time
 
 from numpy.testing import assert_equal
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import map_reduce  # noqa: E402
 
-def read_input(input_file) -> list[(int, list[int])]:
+
+# Most equations are settled within a few microseconds by the pruned backward search
+MIN_PARALLEL_SIZE = 20_000
+
+
+def read_file(input_file: str) -> str:
     with open(input_file, 'r') as file:
-        equations = []
-        for line in file.readlines():
-            test_result, numbers = line.split(':')
-            numbers = list(map(int, numbers.split()))
-            equations.append((int(test_result), numbers))
-        return equations
+        return file.read()
 
 
-def solve_part1(input_file: str) -> int:
-    equations = read_input(input_file)
+def read_input(input_file) -> list[(int, list[int])]:
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[(int, list[int])]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    equations = []
+    for line in text.splitlines():
+        test_result, numbers = line.split(':')
+        numbers = list(map(int, numbers.split()))
+        equations.append((int(test_result), numbers))
+    return equations
+
+
+# Equations with at least meet_in_the_middle_length numbers are solved by meeting in the middle
+def calibration_sum(equations: list[(int, list[int])], concatenation: bool = False,
+                    meet_in_the_middle_length: int = 25) -> int:
+    return sum(result for result, numbers in equations if
+               (can_be_made_meet_in_the_middle if len(numbers) >= meet_in_the_middle_length else can_be_made)(
+                   result, numbers, concatenation))
+
+
+# Works backwards from the result: the last number can only have been added when the result is at least that number,
+# multiplied when it divides the result, and concatenated when the result ends with its digits. Each option leaves a
+# smaller result for the numbers before it, and the search stops at the first way of making the result.
+def can_be_made(result: int, numbers: list[int], concatenation: bool = False) -> bool:
+    stack = [(result, len(numbers) - 1)]
+    while stack:
+        target, index = stack.pop()
+        number = numbers[index]
+        if index == 0:
+            if target == number:
+                return True
+            continue
+        if number == 0 and target == 0:
+            # Whatever the numbers before it make, multiplying by 0 makes 0
+            return True
+        if target >= number:
+            stack.append((target - number, index - 1))
+        if number != 0 and target % number == 0:
+            stack.append((target // number, index - 1))
+        if concatenation and target >= number:
+            power = power_of_ten_above(number)
+            if (target - number) % power == 0:
+                stack.append(((target - number) // power, index - 1))
+    return False
+
+
+# The values the numbers before the split can make going forwards are matched with the values they would have to make
+# going backwards from the result through the numbers after the split. Going backwards prunes far more, so by default
+# only the first third of the numbers is expanded forwards. When either set grows beyond max_states the equation is
+# left to the depth-first search instead.
+def can_be_made_meet_in_the_middle(result: int, numbers: list[int], concatenation: bool = False, split: int = None,
+                                   max_states: int = 1 << 18) -> bool:
+    split = max(1, len(numbers) // 3 if split is None else split)
+    made = {numbers[0]}
+    for number in numbers[1:split]:
+        made = {value for made_value in made for value in
+                ((made_value + number, made_value * number, concat(made_value, number)) if concatenation else
+                 (made_value + number, made_value * number)) if value <= result}
+        if number == 0:
+            # Values pruned for being too large still make 0 when multiplied by 0
+            made.add(0)
+        if len(made) > max_states:
+            return can_be_made(result, numbers, concatenation)
+    needed = {result}
+    for number in reversed(numbers[split:]):
+        power = power_of_ten_above(number)
+        next_needed = set()
+        for target in needed:
+            if number == 0 and target == 0:
+                return True
+            if target >= number:
+                next_needed.add(target - number)
+                if concatenation and (target - number) % power == 0:
+                    next_needed.add((target - number) // power)
+            if number != 0 and target % number == 0:
+                next_needed.add(target // number)
+        needed = next_needed
+        if len(needed) > max_states:
+            return can_be_made(result, numbers, concatenation)
+    return not made.isdisjoint(needed)
+
+
+def power_of_ten_above(number: int) -> int:
+    power = 10
+    while power <= number:
+        power *= 10
+    return power
+
+
+def forward_calibration_sum(equations: list[(int, list[int])], concatenation: bool = False) -> int:
     result_sum = 0
     for result, numbers in equations:
         possibilities = [numbers[0]]
         for number in numbers[1:]:
-            possibilities = [item for possibility in possibilities for item in
-                             [number + possibility, number * possibility] if
-                             item <= result]
+            if concatenation:
+                possibilities = [item for possibility in possibilities for item in
+                                 [number + possibility, number * possibility, concat(possibility, number)] if
+                                 item <= result]
+            else:
+                possibilities = [item for possibility in possibilities for item in
+                                 [number + possibility, number * possibility] if
+                                 item <= result]
         result_sum += result if result in possibilities else 0
     return result_sum
 
 
+def solve_part1(input_file: str) -> int:
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    equations = parse_input(buffer)
+    return map_reduce(equations, calibration_sum, MIN_PARALLEL_SIZE)
+
+
 def concat(n1: int, n2: int) -> int:
-    return int(str(n1) + str(n2))
+    return n1 * power_of_ten_above(n2) + n2
 
 
 def solve_part2(input_file: str) -> int:
-    equations = read_input(input_file)
-    result_sum = 0
-    for result, numbers in equations:
-        possibilities = [numbers[0]]
-        for number in numbers[1:]:
-            possibilities = [item for possibility in possibilities for item in
-                             [number + possibility, number * possibility, concat(possibility, number)] if
-                             item <= result]
-        result_sum += result if result in possibilities else 0
-    return result_sum
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    equations = parse_input(buffer)
+    return map_reduce(equations, functools.partial(calibration_sum, concatenation=True), MIN_PARALLEL_SIZE)
 
 
 def solve_part(part: int) -> int:
@@ -53,11 +158,23 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 5837374519342, 2: 492383931650959}
-assert_equal(solve_part1('test1.txt'), 3749, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test1.txt'), 11387, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+if __name__ == '__main__':
+    correct_answers = {1: 5837374519342, 2: 492383931650959}
+    assert_equal(solve_part1('test1.txt'), 3749, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test1.txt'), 11387, 'Incorrect answer to example.')
+    assert_equal(forward_calibration_sum(read_input('test1.txt'), concatenation=True), 11387,
+                 'Incorrect answer to example when expanding forward.')
+    assert_equal(calibration_sum([(0, [14, 0]), (45, [12, 2, 0, 16, 20, 9])]), 45,
+                 'Incorrect answer to equations multiplied by 0.')
+    assert_equal(calibration_sum([(0, [14, 0]), (45, [12, 2, 0, 16, 20, 9]), (5, [3, 4, 0, 5])],
+                                 meet_in_the_middle_length=0), 50,
+                 'Incorrect answer to equations multiplied by 0 when meeting in the middle.')
+    assert_equal(calibration_sum(read_input('test1.txt'), concatenation=True, meet_in_the_middle_length=0), 11387,
+                 'Incorrect answer to example when meeting in the middle.')
+    assert_equal(map_reduce(read_input('test1.txt'), functools.partial(calibration_sum, concatenation=True),
+                            min_parallel_size=0), 11387, 'Incorrect answer to example in parallel.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -1,11 +1,22 @@
 import string
 import time
 
+import numpy
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> list[list[str]]:
-    return [[character for character in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[list[str]]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [[character for character in line.rstrip()] for line in text.splitlines()]
 
 
 class Matrix:
@@ -75,6 +86,37 @@ class Matrix:
         return self._the_matrix_as_list.count(item)
 
 
+# Finds all antennas in one pass over the map and groups their (x, y) locations by frequency
+def parse_antenna_map(buffer: str | bytes | memoryview) -> (dict[str, numpy.array], (int, int)):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    lines = [line.rstrip() for line in text.splitlines()]
+    grid = numpy.frombuffer(''.join(lines).encode(), dtype=numpy.uint8).reshape(len(lines), -1)
+    is_frequency = numpy.zeros(256, dtype=bool)
+    is_frequency[list((string.ascii_letters + string.digits).encode())] = True
+    ys, xs = numpy.nonzero(is_frequency[grid])
+    frequencies = grid[ys, xs]
+    order = numpy.argsort(frequencies, kind='stable')
+    locations = numpy.stack((xs, ys), axis=1)[order]
+    values, starts = numpy.unique(frequencies[order], return_index=True)
+    groups = {chr(value): group for value, group in zip(values, numpy.split(locations, starts[1:]))}
+    return groups, (grid.shape[1], grid.shape[0])
+
+
+# Marks the antinodes 2a - b of every ordered pair of different antennas in the map of antinodes. The pairs are
+# generated by broadcasting, block_size antennas a at a time so the pair matrix stays small for large groups.
+def mark_pair_antinodes(locations: numpy.array, antinode_map: numpy.array, block_size: int = 1024):
+    height, width = antinode_map.shape
+    xs, ys = locations[:, 0], locations[:, 1]
+    for start in range(0, len(locations), block_size):
+        antinode_xs = 2 * xs[start:start + block_size, None] - xs[None, :]
+        antinode_ys = 2 * ys[start:start + block_size, None] - ys[None, :]
+        # An antenna paired with itself is moved out of the map
+        block_indices = numpy.arange(len(antinode_xs))
+        antinode_xs[block_indices, start + block_indices] = -1
+        in_bounds = (antinode_xs >= 0) & (antinode_xs < width) & (antinode_ys >= 0) & (antinode_ys < height)
+        antinode_map.flat[antinode_ys[in_bounds] * width + antinode_xs[in_bounds]] = True
+
+
 def find_antinodes_part1(antenna_locations: list[(int, int)]) -> list[(int, int)]:
     antinodes = []
     for i, location1 in enumerate(antenna_locations):
@@ -88,7 +130,19 @@ def find_antinodes_part1(antenna_locations: list[(int, int)]) -> list[(int, int)
 
 
 def solve_part1(input_file: str) -> int:
-    the_map = Matrix(read_input(input_file))
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    groups, (width, height) = parse_antenna_map(buffer)
+    antinode_map = numpy.zeros((height, width), dtype=bool)
+    for locations in groups.values():
+        mark_pair_antinodes(locations, antinode_map)
+    return int(antinode_map.sum())
+
+
+def solve_part1_with_matrix(buffer: str | bytes | memoryview) -> int:
+    the_map = Matrix(parse_input(buffer))
     antinodes = set()
     for frequency in string.ascii_letters + string.digits:
         antenna_locations = the_map.find_all(frequency)
@@ -98,6 +152,40 @@ def solve_part1(input_file: str) -> int:
     return len(antinodes)
 
 
+# The antinodes of the pair of antennas a and b are a + n * (b - a) for every whole n keeping them on the map. The range
+# of n is worked out per axis, and the lines of max_pairs pairs at a time are marked at once. With full_line the step
+# is divided by gcd(dx, dy), which marks every grid point in line with the two antennas as the puzzle describes. By
+# default only the multiples of their distance are marked, like find_antinodes_part2, which gives the same answer
+# whenever gcd(dx, dy) is 1, as it is for all pairs in the puzzle inputs.
+def mark_resonant_antinodes(locations: numpy.array, antinode_map: numpy.array, full_line: bool = False,
+                            max_pairs: int = 1 << 16):
+    height, width = antinode_map.shape
+    first, second = numpy.triu_indices(len(locations), 1)
+    for start in range(0, len(first), max_pairs):
+        origins = locations[first[start:start + max_pairs]]
+        steps = locations[second[start:start + max_pairs]] - origins
+        if full_line:
+            steps //= numpy.gcd(steps[:, 0], steps[:, 1])[:, None]
+        lowest_n = numpy.full(len(steps), numpy.iinfo(numpy.int64).min)
+        highest_n = numpy.full(len(steps), numpy.iinfo(numpy.int64).max)
+        for axis, size in (0, width), (1, height):
+            position, step = origins[:, axis], steps[:, axis]
+            # Along an axis where the line goes backwards, the distances to the two edges swap roles
+            forward = step > 0
+            distance_back = numpy.where(forward, position, size - 1 - position)
+            distance_ahead = numpy.where(forward, size - 1 - position, position)
+            length = numpy.maximum(numpy.abs(step), 1)
+            moving = step != 0
+            lowest_n = numpy.where(moving, numpy.maximum(lowest_n, -(distance_back // length)), lowest_n)
+            highest_n = numpy.where(moving, numpy.minimum(highest_n, distance_ahead // length), highest_n)
+        n_antinodes = highest_n - lowest_n + 1
+        pairs = numpy.repeat(numpy.arange(len(steps)), n_antinodes)
+        n = lowest_n[pairs] + numpy.arange(len(pairs)) - numpy.repeat(numpy.cumsum(n_antinodes) - n_antinodes,
+                                                                      n_antinodes)
+        antinodes = origins[pairs] + n[:, None] * steps[pairs]
+        antinode_map.flat[antinodes[:, 1] * width + antinodes[:, 0]] = True
+
+
 def find_antinodes_part2(antenna_locations: list[(int, int)], width: int, height: int) -> list[(int, int)]:
     antinodes = []
     for i, location1 in enumerate(antenna_locations):
@@ -125,7 +213,19 @@ def find_antinodes_part2(antenna_locations: list[(int, int)], width: int, height
 
 
 def solve_part2(input_file: str) -> int:
-    the_map = Matrix(read_input(input_file))
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    groups, (width, height) = parse_antenna_map(buffer)
+    antinode_map = numpy.zeros((height, width), dtype=bool)
+    for locations in groups.values():
+        mark_resonant_antinodes(locations, antinode_map)
+    return int(antinode_map.sum())
+
+
+def solve_part2_with_matrix(buffer: str | bytes | memoryview) -> int:
+    the_map = Matrix(parse_input(buffer))
     antinodes = set()
     for frequency in string.ascii_letters + string.digits:
         antenna_locations = the_map.find_all(frequency)
@@ -144,13 +244,16 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 271, 2: 994}
+if __name__ == '__main__':
+    correct_answers = {1: 271, 2: 994}
 
-assert_equal(solve_part1('test1.txt'), 14, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test2.txt'), 9, 'Incorrect answer to example.')
-assert_equal(solve_part2('test1.txt'), 34, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 14, 'Incorrect answer to example.')
+    assert_equal(solve_part1_with_matrix(read_file('test1.txt')), 14, 'Incorrect answer to example with the matrix.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test2.txt'), 9, 'Incorrect answer to example.')
+    assert_equal(solve_part2('test1.txt'), 34, 'Incorrect answer to example.')
+    assert_equal(solve_part2_with_matrix(read_file('test1.txt')), 34, 'Incorrect answer to example with the matrix.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -4,9 +4,18 @@ import time
 from numpy.testing import assert_equal
 
 
-def read_input(input_file: str) -> list[int]:
+def read_file(input_file: str) -> str:
     with open(input_file, 'r') as file:
-        return [int(digit) for digit in file.read().rstrip()]
+        return file.read()
+
+
+def read_input(input_file: str) -> list[int]:
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[int]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [int(digit) for digit in text.rstrip()]
 
 
 class DiskIterator:
@@ -75,7 +84,11 @@ class DiskIterator:
 
 
 def solve_part1(input_file: str) -> int:
-    diskmap = read_input(input_file)
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    diskmap = parse_input(buffer)
     total_checksum = 0
     front_iter = DiskIterator(diskmap, True)
     back_iter = DiskIterator(diskmap, False)
@@ -122,7 +135,11 @@ def disk_checksum(diskmap: list[int], file_ids: list[int]):
 
 
 def solve_part2(input_file: str) -> int:
-    diskmap = read_input(input_file)
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    diskmap = parse_input(buffer)
     # files[i] = [data_start, data-length]
     files = [[0, 0] for i in range(0, len(diskmap) // 2 + 1)]
     spaces = [[0, 0] for i in range(0, len(diskmap) // 2)]
@@ -160,12 +177,13 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 6356833654075, 2: 6389911791746}
+if __name__ == '__main__':
+    correct_answers = {1: 6356833654075, 2: 6389911791746}
 
-assert_equal(solve_part1('test1.txt'), 1928, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test1.txt'), 2858, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 1928, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test1.txt'), 2858, 'Incorrect answer to example.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -4,8 +4,18 @@ import numpy
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> list[list[int]]:
-    return [[int(digit) for digit in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[list[int]]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [[int(digit) for digit in line.rstrip()] for line in text.splitlines()]
 
 
 class Matrix:
@@ -82,7 +92,11 @@ class Matrix:
 
 
 def solve_part1(input_file: str) -> int:
-    topo = Matrix(read_input(input_file), '!')
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    topo = Matrix(parse_input(buffer), '!')
     trail = topo.find_all(0)
     score = 0
     for start in trail:
@@ -100,7 +114,11 @@ def solve_part1(input_file: str) -> int:
 
 
 def solve_part2(input_file: str) -> int:
-    topo = Matrix(read_input(input_file), '!')
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    topo = Matrix(parse_input(buffer), '!')
     trail = topo.find_all(0)
     score = 0
     for start in trail:
@@ -126,12 +144,13 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 786, 2: 1722}
+if __name__ == '__main__':
+    correct_answers = {1: 786, 2: 1722}
 
-assert_equal(solve_part1('test1.txt'), 36, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test1.txt'), 81, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 36, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test1.txt'), 81, 'Incorrect answer to example.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
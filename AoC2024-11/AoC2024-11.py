@@ -5,8 +5,18 @@ from functools import cache
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> list[int]:
-    return [int(digit) for line in open(input_file, 'r').readlines() for digit in line.rstrip().split()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[int]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [int(digit) for line in text.splitlines() for digit in line.rstrip().split()]
 
 
 def cut_in_two(stone: int) -> (int, int):
@@ -43,12 +53,20 @@ def count_stones(blinks: int, stones: list[int]) -> int:
 
 
 def solve_part1(input_file: str) -> int:
-    stones = read_input(input_file)
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    stones = parse_input(buffer)
     return count_stones(25, stones)
 
 
 def solve_part2(input_file: str) -> int:
-    stones = read_input(input_file)
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    stones = parse_input(buffer)
     return count_stones(75, stones)
 
 
@@ -62,12 +80,13 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 212655, 2: 253582809724830}
+if __name__ == '__main__':
+    correct_answers = {1: 212655, 2: 253582809724830}
 
-# Since return values are cached the timing will be off if the tests are run first
-# assert_equal(solve_part1('test1.txt'), 55312, 'Incorrect answer to example.')
-# assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-# assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    # Since return values are cached the timing will be off if the tests are run first
+    # assert_equal(solve_part1('test1.txt'), 55312, 'Incorrect answer to example.')
+    # assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    # assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-solve_part(1)
-solve_part(2)
+    solve_part(1)
+    solve_part(2)
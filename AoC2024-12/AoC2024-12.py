@@ -3,8 +3,18 @@ import time
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> list[list[(str, bool)]]:
-    return [[[character, False] for character in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[list[(str, bool)]]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [[[character, False] for character in line.rstrip()] for line in text.splitlines()]
 
 
 class Matrix:
@@ -146,7 +156,11 @@ def calculate_sides(garden: Matrix, region: list[(int, int)], plant: str) -> int
 
 
 def solve_part1(input_file: str) -> int:
-    garden = Matrix(read_input(input_file), ['!', True])
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    garden = Matrix(parse_input(buffer), ['!', True])
     return fence_price(garden)
 
 
@@ -171,7 +185,11 @@ def fence_price(garden: Matrix, discount: bool = False) -> int:
 
 
 def solve_part2(input_file: str) -> int:
-    garden = Matrix(read_input(input_file), ['!', True])
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    garden = Matrix(parse_input(buffer), ['!', True])
     return fence_price(garden, True)
 
 
@@ -185,12 +203,13 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 1375476, 2: 821372}
+if __name__ == '__main__':
+    correct_answers = {1: 1375476, 2: 821372}
 
-assert_equal(solve_part1('test1.txt'), 1930, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test2.txt'), 236, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 1930, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test2.txt'), 236, 'Incorrect answer to example.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
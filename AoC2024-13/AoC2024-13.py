@@ -1,11 +1,30 @@
+import os
+import sys
 import time
 
 from numpy.testing import assert_equal
 import regex
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import map_reduce  # noqa: E402
+
+
+# Solving the two linear equations of a machine takes well under a microsecond
+MIN_PARALLEL_SIZE = 100_000
+
+
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
 
 def read_input(input_file: str, p_extra: int = 0) -> list[((int, int), (int, int), (int, int))]:
-    lines = [line.rstrip() for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file), p_extra)
+
+
+def parse_input(buffer: str | bytes | memoryview, p_extra: int = 0) -> list[((int, int), (int, int), (int, int))]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    lines = [line.rstrip() for line in text.splitlines()]
     index = 0
     machine_info = []
     while index < len(lines):
@@ -50,13 +69,21 @@ def least_tokens(machine_info) -> int:
 
 
 def solve_part1(input_file: str) -> int:
-    machine_info = read_input(input_file)
-    return least_tokens(machine_info)
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    machine_info = parse_input(buffer)
+    return map_reduce(machine_info, least_tokens, MIN_PARALLEL_SIZE)
 
 
 def solve_part2(input_file: str) -> int:
-    machine_info = read_input(input_file, 10000000000000)
-    return least_tokens(machine_info)
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    machine_info = parse_input(buffer, 10000000000000)
+    return map_reduce(machine_info, least_tokens, MIN_PARALLEL_SIZE)
 
 
 def solve_part(part: int) -> int:
@@ -69,12 +96,15 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 27157, 2: 104015411578548}
+if __name__ == '__main__':
+    correct_answers = {1: 27157, 2: 104015411578548}
 
-assert_equal(solve_part1('test1.txt'), 480, 'Incorrect answer to example.')
-assert_equal(solve_part1('test2.txt'), 7, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 480, 'Incorrect answer to example.')
+    assert_equal(solve_part1('test2.txt'), 7, 'Incorrect answer to example.')
+    assert_equal(map_reduce(read_input('test1.txt'), least_tokens, min_parallel_size=0), 480,
+                 'Incorrect answer to example in parallel.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
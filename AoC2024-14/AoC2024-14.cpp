@@ -6,6 +6,8 @@
 #include <algorithm>
 #include <chrono>
 #include <sstream>
+#include <stdexcept>
+#include <string_view>
 
 using namespace std;
 
@@ -24,18 +26,27 @@ struct Robot
     Vec2 vel;
 };
 
-vector<Robot> read_input(const std::string &file_name)
+// Parses the robots directly from a buffer already in memory
+vector<Robot> parse_input(string_view buffer)
 {
     vector<Robot> robots;
-    ifstream input_file(file_name);
-    stringstream ss;
-    ss << input_file.rdbuf();
-    string str;
-    match_results<std::string::const_iterator> match;
+    match_results<string_view::const_iterator> match;
     basic_regex regex(R"(p=(-?\d+),(-?\d+) v=(-?\d+),(-?\d+))");
-    while (getline(ss, str))
+    for (auto line : buffer | ranges::views::split('\n'))
     {
-        regex_match(str, match, regex);
+        string_view str(line.begin(), line.end());
+        if (str.ends_with('\r'))
+        {
+            str.remove_suffix(1);
+        }
+        if (str.empty())
+        {
+            continue;
+        }
+        if (!regex_match(str.cbegin(), str.cend(), match, regex))
+        {
+            throw invalid_argument("Invalid robot: " + string(str));
+        }
         auto vec = match | ranges::views::drop(1) | ranges::views::transform([](auto &m)
                                                                              { return stoi(m.str()); });
         robots.emplace_back(Robot({vec[0], vec[1]}, {vec[2], vec[3]}));
@@ -43,6 +54,14 @@ vector<Robot> read_input(const std::string &file_name)
     return robots;
 }
 
+vector<Robot> read_input(const std::string &file_name)
+{
+    ifstream input_file(file_name);
+    stringstream ss;
+    ss << input_file.rdbuf();
+    return parse_input(ss.view());
+}
+
 int better_mod(int n, int m)
 {
     return n < 0 ? n - m * (n / m - 1) : n % m;
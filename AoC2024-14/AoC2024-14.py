@@ -5,8 +5,18 @@ from numpy.testing import assert_equal
 import regex
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> list[(int, int, int, int)]:
-    lines = [line.rstrip() for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[(int, int, int, int)]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    lines = [line.rstrip() for line in text.splitlines()]
     robots = []
     for line in lines:
         robots.append([int(x) for x in regex.fullmatch(r'p=(-?\d+),(-?\d+) v=(-?\d+),(-?\d+)', line)[1:]])
@@ -98,12 +108,20 @@ def print_tree_from_file(file_name: str, generation: int):
 
 
 def solve_part1(input_file: str, width=101, height=103) -> int:
-    robots = read_input(input_file)
+    return solve_part1_from_buffer(read_file(input_file), width, height)
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview, width=101, height=103) -> int:
+    robots = parse_input(buffer)
     return predict_positions(robots, 100, width, height)
 
 
 def solve_part2(input_file: str, manually=False) -> int:
-    robots = read_input(input_file)
+    return solve_part2_from_buffer(read_file(input_file), manually)
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview, manually=False) -> int:
+    robots = parse_input(buffer)
     if manually:
         return inspect_positions(robots, 103, 0)
     # The data has a period of 101 in x and 103 in y, respectively.
@@ -149,15 +167,16 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 222208000, 2: 7623}
+if __name__ == '__main__':
+    correct_answers = {1: 222208000, 2: 7623}
 
-assert_equal(solve_part1('test1.txt', 11, 7), 12, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
-assert_equal(solve_part2('other_input.txt'), 2241, f'Incorrect answer to part 2')
-assert_equal(solve_part2('another_input.txt'), 42, f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt', 11, 7), 12, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part2('other_input.txt'), 2241, f'Incorrect answer to part 2')
+    assert_equal(solve_part2('another_input.txt'), 42, f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
 
-print_tree_from_file('input.txt', correct_answers[2])
+    print_tree_from_file('input.txt', correct_answers[2])
@@ -4,8 +4,18 @@ import numpy
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> (list[list[str]], list[str]):
-    lines = [[character for character in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (list[list[str]], list[str]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    lines = [[character for character in line.rstrip()] for line in text.splitlines()]
     warehouse = []
     moves = []
     fill_moves = False
@@ -208,14 +218,22 @@ def gps_sum(warehouse: Matrix, item: str) -> int:
 
 
 def solve_part1(input_file: str) -> int:
-    warehouse, moves = read_input(input_file)
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    warehouse, moves = parse_input(buffer)
     warehouse = Matrix(warehouse)
     move_around(warehouse, moves)
     return gps_sum(warehouse, 'O')
 
 
 def solve_part2(input_file: str) -> int:
-    warehouse, moves = read_input(input_file)
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    warehouse, moves = parse_input(buffer)
     warehouse = widen(warehouse)
     warehouse = Matrix(warehouse)
     move_around(warehouse, moves)
@@ -232,14 +250,15 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 1514333, 2: 1528453}
+if __name__ == '__main__':
+    correct_answers = {1: 1514333, 2: 1528453}
 
-assert_equal(solve_part1('test1.txt'), 2028, 'Incorrect answer to example.')
-assert_equal(solve_part1('test2.txt'), 10092, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test3.txt'), 618, 'Incorrect answer to example.')
-assert_equal(solve_part2('test2.txt'), 9021, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 2028, 'Incorrect answer to example.')
+    assert_equal(solve_part1('test2.txt'), 10092, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test3.txt'), 618, 'Incorrect answer to example.')
+    assert_equal(solve_part2('test2.txt'), 9021, 'Incorrect answer to example.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -4,8 +4,18 @@ from sortedcontainers import SortedList
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> (list[list[str]], list[str]):
-    return [[character for character in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (list[list[str]], list[str]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [[character for character in line.rstrip()] for line in text.splitlines()]
 
 
 class Grid:
@@ -180,12 +190,20 @@ def solve_maze(maze: Grid) -> (int, dict[Raindeer, int]):
 
 
 def solve_part1(input_file: str) -> int:
-    maze = Grid(read_input(input_file))
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    maze = Grid(parse_input(buffer))
     return solve_maze(maze)[0]
 
 
 def solve_part2(input_file: str) -> int:
-    maze = Grid(read_input(input_file))
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    maze = Grid(parse_input(buffer))
     _, states = solve_maze(maze)
     return descend_score(maze.find('E'), states)
 
@@ -200,14 +218,15 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 85420, 2: 492}
+if __name__ == '__main__':
+    correct_answers = {1: 85420, 2: 492}
 
-assert_equal(solve_part1('test1.txt'), 7036, 'Incorrect answer to example.')
-assert_equal(solve_part1('test2.txt'), 11048, 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test1.txt'), 45, 'Incorrect answer to example.')
-assert_equal(solve_part2('test2.txt'), 64, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 7036, 'Incorrect answer to example.')
+    assert_equal(solve_part1('test2.txt'), 11048, 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test1.txt'), 45, 'Incorrect answer to example.')
+    assert_equal(solve_part2('test2.txt'), 64, 'Incorrect answer to example.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -1,10 +1,26 @@
+import os
+import sys
+import tempfile
 import time
 
 from numpy.testing import assert_equal
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import Checkpoint, SearchInterrupted  # noqa: E402
+
+
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
 
 def read_input(input_file: str) -> (list[int], list[int]):
-    lines = [line.rstrip() for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (list[int], list[int]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    lines = [line.rstrip() for line in text.splitlines()]
     registers = []
     for i in range(0, 3):
         registers.append(int(lines[i].split(':')[1].rstrip()))
@@ -62,34 +78,54 @@ def execute_program(reg: list[int], prg: list[int], stop_at_first_output: bool =
 
 
 def solve_part1(input_file: str) -> str:
-    reg, prg = read_input(input_file)
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> str:
+    reg, prg = parse_input(buffer)
     prg_output = execute_program(reg, prg)
     return ','.join(map(str, prg_output))
 
 
-def find_digits(prg, output_index: int, known_digits: int = 0) -> int or None:
-    if output_index < 0:
-        return known_digits
-    candidate_reg_a = None
-    known_digits = known_digits << 3
-    for n in range(0, 8):
-        reg_a = known_digits + n
-        prg_output = execute_program([reg_a, 0, 0], prg, True)
-        if prg_output[0] == prg[output_index]:
-            reg_a = find_digits(prg, output_index - 1, reg_a)
-            if reg_a is not None:
-                if candidate_reg_a is None:
-                    candidate_reg_a = reg_a
-                else:
-                    candidate_reg_a = min(candidate_reg_a, reg_a)
-    if candidate_reg_a is None:
-        return None
-    return candidate_reg_a
-
-
-def solve_part2(input_file: str) -> int:
-    _, prg = read_input(input_file)
-    reg_a = find_digits(prg, len(prg) - 1)
+# Depth first search over the octal digits of register A, most significant digit first. The frontier holds the
+# (output_index, known_digits) pairs still to be expanded. Since every complete candidate has the same number of digits
+# and smaller digits are expanded first, the first complete candidate found is the smallest one.
+def find_digits(prg, output_index: int, known_digits: int = 0, checkpoint: Checkpoint = None,
+                resume: bool = False) -> int or None:
+    frontier = [(output_index, known_digits)]
+    state = checkpoint.load() if checkpoint is not None and resume else None
+    if state is not None:
+        if state['program'] != prg:
+            raise Exception('The checkpoint was not made for this program.')
+        frontier = [(index, digits) for index, digits in state['frontier']]
+    while frontier:
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save({'program': prg, 'frontier': frontier})
+        output_index, known_digits = frontier.pop()
+        if output_index < 0:
+            if checkpoint is not None:
+                checkpoint.save({'program': prg, 'frontier': [(output_index, known_digits)]})
+            return known_digits
+        known_digits = known_digits << 3
+        for n in range(7, -1, -1):
+            reg_a = known_digits + n
+            prg_output = execute_program([reg_a, 0, 0], prg, True)
+            if prg_output[0] == prg[output_index]:
+                frontier.append((output_index - 1, reg_a))
+    return None
+
+
+# The checkpoint holds the program and the frontier of the digit search
+def solve_part2(input_file: str, checkpoint_file: str = None, resume: bool = False,
+                checkpoint_interval: float = 60.0) -> int:
+    return solve_part2_from_buffer(read_file(input_file), checkpoint_file, resume, checkpoint_interval)
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview, checkpoint_file: str = None, resume: bool = False,
+                            checkpoint_interval: float = 60.0) -> int:
+    _, prg = parse_input(buffer)
+    checkpoint = None if checkpoint_file is None else Checkpoint(checkpoint_file, checkpoint_interval)
+    reg_a = find_digits(prg, len(prg) - 1, checkpoint=checkpoint, resume=resume)
     return reg_a
 
 
@@ -103,12 +139,23 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: '7,6,1,5,3,1,4,2,6', 2: 164541017976509}
-
-assert_equal(solve_part1('test1.txt'), '4,6,3,5,6,3,5,2,1,0', 'Incorrect answer to example.')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test2.txt'), 117440, 'Incorrect answer to example.')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
-
-for p in [1, 2]:
-    solve_part(p)
+if __name__ == '__main__':
+    correct_answers = {1: '7,6,1,5,3,1,4,2,6', 2: 164541017976509}
+
+    assert_equal(solve_part1('test1.txt'), '4,6,3,5,6,3,5,2,1,0', 'Incorrect answer to example.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test2.txt'), 117440, 'Incorrect answer to example.')
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        test_checkpoint_file = os.path.join(temporary_directory, 'checkpoint.json')
+        _, test_prg = read_input('test2.txt')
+        try:
+            find_digits(test_prg, len(test_prg) - 1, checkpoint=Checkpoint(test_checkpoint_file, 0, stop_after=10))
+        except SearchInterrupted:
+            pass
+        assert_equal(len(Checkpoint(test_checkpoint_file, 0).load()['frontier']), 8, 'Incorrect interrupted search.')
+        assert_equal(solve_part2('test2.txt', test_checkpoint_file, resume=True), 117440,
+                     'Incorrect answer to example after resuming.')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+
+    for p in [1, 2]:
+        solve_part(p)
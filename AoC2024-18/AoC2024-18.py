@@ -6,8 +6,18 @@ from sortedcontainers import SortedList
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> (list[list[str]], list[str]):
-    return [tuple(map(int, line.rstrip().split(','))) for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (list[list[str]], list[str]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [tuple(map(int, line.rstrip().split(','))) for line in text.splitlines()]
 
 
 class MemoryLocation:
@@ -53,14 +63,22 @@ def solve_maze(blocks: set[(int, int)], end_pos: (int, int) = (70, 70)) -> int:
 
 
 def solve_part1(input_file: str) -> int:
-    block_list = read_input(input_file)[:1024]
+    return solve_part1_from_buffer(read_file(input_file))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    block_list = parse_input(buffer)[:1024]
     blocks = set()
     blocks.update(block_list)
     return solve_maze(blocks)
 
 
 def solve_part2(input_file: str) -> str:
-    block_list = read_input(input_file)
+    return solve_part2_from_buffer(read_file(input_file))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> str:
+    block_list = parse_input(buffer)
     lower_block_index = 0
     upper_block_index = len(block_list)
     while upper_block_index - lower_block_index > 1:
@@ -85,10 +103,11 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 404, 2: '(27, 60)'}
+if __name__ == '__main__':
+    correct_answers = {1: 404, 2: '(27, 60)'}
 
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -1,11 +1,31 @@
+import functools
+import os
+import sys
 import time
 from functools import cache
 
 from numpy.testing import assert_equal
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import map_reduce  # noqa: E402
+
+
+# A design takes milliseconds to count, so even the few hundred designs of an input are worth spreading over the pool
+MIN_PARALLEL_SIZE = 20
+
+
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
 
 def read_input(input_file: str) -> (tuple[str], list[str]):
-    lines = [line.rstrip() for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (tuple[str], list[str]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    lines = [line.rstrip() for line in text.splitlines()]
     available_patterns = tuple([x.strip() for x in lines[0].split(',')])
     return available_patterns, lines[2:]
 
@@ -24,8 +44,7 @@ def match_variations(wanted_pattern: str, available_patterns: tuple[str], index:
     return variations
 
 
-def solve_part1(file_name: str) -> int:
-    available_patterns, wanted_patterns = read_input(file_name)
+def count_possible_designs(wanted_patterns: list[str], available_patterns: tuple[str]) -> int:
     possibles = 0
     for wanted_pattern in wanted_patterns:
         if match_variations(wanted_pattern, available_patterns) > 0:
@@ -33,14 +52,34 @@ def solve_part1(file_name: str) -> int:
     return possibles
 
 
-def solve_part2(file_name: str) -> int:
-    available_patterns, wanted_patterns = read_input(file_name)
+def count_arrangements(wanted_patterns: list[str], available_patterns: tuple[str]) -> int:
     possibilities = 0
     for wanted_pattern in wanted_patterns:
         possibilities += match_variations(wanted_pattern, available_patterns)
     return possibilities
 
 
+def solve_part1(file_name: str) -> int:
+    return solve_part1_from_buffer(read_file(file_name))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    available_patterns, wanted_patterns = parse_input(buffer)
+    return map_reduce(wanted_patterns,
+                      functools.partial(count_possible_designs, available_patterns=available_patterns),
+                      MIN_PARALLEL_SIZE)
+
+
+def solve_part2(file_name: str) -> int:
+    return solve_part2_from_buffer(read_file(file_name))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    available_patterns, wanted_patterns = parse_input(buffer)
+    return map_reduce(wanted_patterns, functools.partial(count_arrangements, available_patterns=available_patterns),
+                      MIN_PARALLEL_SIZE)
+
+
 def solve_part(part: int) -> int:
     if not 0 < part <= 2:
         raise Exception("Part must be either 1 or 2.")
@@ -51,12 +90,17 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 302, 2: 771745460576799}
+if __name__ == '__main__':
+    correct_answers = {1: 302, 2: 771745460576799}
+
+    # assert_equal(solve_part1('test1.txt'), 6, f'Incorrect answer to test')
+    # assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    # assert_equal(solve_part2('test1.txt'), 16, f'Incorrect answer to test')
+    # assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-# assert_equal(solve_part1('test1.txt'), 6, f'Incorrect answer to test')
-# assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-# assert_equal(solve_part2('test1.txt'), 16, f'Incorrect answer to test')
-# assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    available, wanted = read_input('test1.txt')
+    assert_equal(map_reduce(wanted, functools.partial(count_arrangements, available_patterns=available),
+                            min_parallel_size=0), 16, f'Incorrect answer to test in parallel')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -5,8 +5,18 @@ from sortedcontainers import SortedList
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> (list[list[str]], list[str]):
-    return [[character for character in line.rstrip()] for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (list[list[str]], list[str]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [[character for character in line.rstrip()] for line in text.splitlines()]
 
 
 class Grid:
@@ -147,7 +157,11 @@ def find_number_of_cheats(maze: Grid, fw_times: dict[(int, int), int], bw_times:
 
 
 def count_cheats(file_name: str, cheat_time: int, min_savings: int) -> int:
-    maze = Grid(read_input(file_name))
+    return count_cheats_from_buffer(read_file(file_name), cheat_time, min_savings)
+
+
+def count_cheats_from_buffer(buffer: str | bytes | memoryview, cheat_time: int, min_savings: int) -> int:
+    maze = Grid(parse_input(buffer))
     forward_steps = solve_maze(maze, 'S', 'E', '#')
     backward_steps = solve_maze(maze, 'E', 'S', '#')
     return find_number_of_cheats(maze, forward_steps, backward_steps, cheat_time, min_savings)
@@ -157,10 +171,18 @@ def solve_part1(file_name: str) -> int:
     return count_cheats(file_name, 2, 100)
 
 
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    return count_cheats_from_buffer(buffer, 2, 100)
+
+
 def solve_part2(file_name: str) -> int:
     return count_cheats(file_name, 20, 100)
 
 
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    return count_cheats_from_buffer(buffer, 20, 100)
+
+
 def solve_part(part: int) -> int:
     if not 0 < part <= 2:
         raise Exception("Part must be either 1 or 2.")
@@ -171,12 +193,13 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 1346, 2: 985482}
+if __name__ == '__main__':
+    correct_answers = {1: 1346, 2: 985482}
 
-assert_equal(count_cheats('test1.txt', 2, 12), 8, f'Incorrect answer to test')
-assert_equal(count_cheats('test1.txt', 20, 50), 285, f'Incorrect answer to test')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(count_cheats('test1.txt', 2, 12), 8, f'Incorrect answer to test')
+    assert_equal(count_cheats('test1.txt', 20, 50), 285, f'Incorrect answer to test')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -1,11 +1,32 @@
+import functools
+import os
+import sys
 import time
 from functools import cache
 
 from numpy.testing import assert_equal
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import map_reduce  # noqa: E402
+
+
+# The cached key press counts make a code cost less than a tenth of a millisecond, and the workers would each have to
+# fill their own cache
+MIN_PARALLEL_SIZE = 1000
+
+
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
 
 def read_input(input_file: str) -> list[str]:
-    return [line.rstrip() for line in open(input_file, 'r').readlines()]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> list[str]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    return [line.rstrip() for line in text.splitlines()]
 
 
 @cache
@@ -69,13 +90,21 @@ def calc_codes(codes: list[str], number_of_robots: int) -> int:
 
 
 def solve_part1(file_name: str) -> int:
-    codes = read_input(file_name)
-    return calc_codes(codes, 3)
+    return solve_part1_from_buffer(read_file(file_name))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    codes = parse_input(buffer)
+    return map_reduce(codes, functools.partial(calc_codes, number_of_robots=3), MIN_PARALLEL_SIZE)
 
 
 def solve_part2(file_name: str) -> int:
-    codes = read_input(file_name)
-    return calc_codes(codes, 26)
+    return solve_part2_from_buffer(read_file(file_name))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> int:
+    codes = parse_input(buffer)
+    return map_reduce(codes, functools.partial(calc_codes, number_of_robots=26), MIN_PARALLEL_SIZE)
 
 
 def solve_part(part: int) -> int:
@@ -88,11 +117,15 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 109758, 2: 134341709499296}
+if __name__ == '__main__':
+    correct_answers = {1: 109758, 2: 134341709499296}
+
+    # assert_equal(solve_part1('test1.txt'), 126384, f'Incorrect answer to test')
+    # assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    # assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-# assert_equal(solve_part1('test1.txt'), 126384, f'Incorrect answer to test')
-# assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-# assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(map_reduce(read_input('test1.txt'), functools.partial(calc_codes, number_of_robots=3),
+                            min_parallel_size=0), 126384, f'Incorrect answer to test in parallel')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -1,22 +1,38 @@
+#include <algorithm>
 #include <bitset>
+#include <charconv>
 #include <chrono>
 #include <fstream>
 #include <iostream>
 #include <sstream>
+#include <string_view>
 #include <vector>
 
 using namespace std;
 
-vector<ulong> read_input(const std::string& file_name) {
+// Parses the secrets directly from a buffer already in memory
+vector<ulong> parse_input(string_view buffer) {
     vector<ulong> secrets;
+    const char* position = buffer.data();
+    const char* end = buffer.data() + buffer.size();
+    while (position < end) {
+        ulong secret;
+        auto [next_position, error] = from_chars(position, end, secret);
+        if (error == errc()) {
+            secrets.push_back(secret);
+            position = next_position;
+        } else {
+            ++position;
+        }
+    }
+    return secrets;
+}
+
+vector<ulong> read_input(const std::string& file_name) {
     ifstream input_file(file_name);
     stringstream ss;
     ss << input_file.rdbuf();
-    string str;
-    while (getline(ss, str)) {
-        secrets.push_back(stoi(str));
-    }
-    return secrets;
+    return parse_input(ss.view());
 }
 
 ulong next_secret(ulong secret) {
@@ -3,9 +3,19 @@ import time
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> dict[str, set[str]]:
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> dict[str, set[str]]:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
     node_connections = {}
-    for a, b in [line.rstrip().split('-') for line in open(input_file, 'r').readlines()]:
+    for a, b in [line.rstrip().split('-') for line in text.splitlines()]:
         node_connections.setdefault(a, set())
         node_connections.setdefault(b, set())
         node_connections[a].add(b)
@@ -31,7 +41,11 @@ def grow_groups(network_connections: dict[str, set[str]], groups: dict[tuple[str
 
 
 def find_network_groups(file_name: str, group_size: int) -> list[tuple[str, ...]]:
-    network_connections = read_input(file_name)
+    return find_network_groups_from_buffer(read_file(file_name), group_size)
+
+
+def find_network_groups_from_buffer(buffer: str | bytes | memoryview, group_size: int) -> list[tuple[str, ...]]:
+    network_connections = parse_input(buffer)
     start_groups = {}
     for node, connections in network_connections.items():
         start_groups[(node,)] = connections
@@ -39,7 +53,11 @@ def find_network_groups(file_name: str, group_size: int) -> list[tuple[str, ...]
 
 
 def solve_part1(file_name: str) -> int:
-    tri_groups = find_network_groups(file_name, 3)
+    return solve_part1_from_buffer(read_file(file_name))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    tri_groups = find_network_groups_from_buffer(buffer, 3)
     number_of_clusters = 0
     for node_i, node_j, node_k in tri_groups:
         if node_i[0] == 't' or node_j[0] == 't' or node_k[0] == 't':
@@ -48,7 +66,11 @@ def solve_part1(file_name: str) -> int:
 
 
 def solve_part2(file_name: str) -> str:
-    largest_groups = find_network_groups(file_name, -1)
+    return solve_part2_from_buffer(read_file(file_name))
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview) -> str:
+    largest_groups = find_network_groups_from_buffer(buffer, -1)
     assert_equal(len(largest_groups), 1)
     return ','.join(largest_groups[0])
 
@@ -63,12 +85,13 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 1352, 2: 'dm,do,fr,gf,gh,gy,iq,jb,kt,on,rg,xf,ze'}
+if __name__ == '__main__':
+    correct_answers = {1: 1352, 2: 'dm,do,fr,gf,gh,gy,iq,jb,kt,on,rg,xf,ze'}
 
-assert_equal(solve_part1('test1.txt'), 7, f'Incorrect answer to test')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('test1.txt'), 'co,de,ka,ta', f'Incorrect answer to test')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+    assert_equal(solve_part1('test1.txt'), 7, f'Incorrect answer to test')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('test1.txt'), 'co,de,ka,ta', f'Incorrect answer to test')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
 
-for p in [1, 2]:
-    solve_part(p)
+    for p in [1, 2]:
+        solve_part(p)
@@ -1,9 +1,15 @@
+import os
 import re
+import sys
+import tempfile
 import time
 from copy import copy
 
 from numpy.testing import assert_equal
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc_shared import Checkpoint, SearchInterrupted  # noqa: E402
+
 
 def and_op(a: int, b: int) -> int:
     return a & b
@@ -52,8 +58,18 @@ class Value:
         return deps
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> ((list[Value], list[Value]), list[Value], dict[str, Value]):
-    initial_wires, gate_connections = [lines.splitlines() for lines in open(input_file, 'r').read().split('\n\n')]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> ((list[Value], list[Value]), list[Value], dict[str, Value]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    initial_wires, gate_connections = [lines.splitlines() for lines in text.split('\n\n')]
 
     values: dict[str, Value] = {}
     input_values = [[], []]
@@ -106,6 +122,26 @@ class Device:
         self.z = z
         self.topo_sorted = []
         self.topo_sort()
+        self.checkpoint = None
+        # Index of the swap being explored at each depth of find_swaps
+        self.search_progress = []
+        self.resume_progress = []
+
+    def set_checkpoint(self, checkpoint: Checkpoint, resume: bool = False):
+        self.checkpoint = checkpoint
+        self.search_progress = []
+        self.resume_progress = []
+        state = checkpoint.load() if resume else None
+        if state is not None:
+            if state['gates'] != self.gate_names():
+                raise Exception('The checkpoint was not made for this device.')
+            self.resume_progress = state['progress']
+
+    def gate_names(self) -> list[str]:
+        return sorted(value.name for value in self.topo_sorted)
+
+    def save_search_progress(self):
+        self.checkpoint.save({'gates': self.gate_names(), 'progress': self.search_progress})
 
     def topo_sort(self):
         visited_values = set()
@@ -216,26 +252,64 @@ class Device:
                     if good:
                         possible_swaps.append((a, b))
                     self.swap_values(a, b)
-        for swap in possible_swaps:
+        # The possible swaps are found in the same order every time, so a resumed search can skip the swaps that were
+        # already explored at each depth
+        depth = len(swaps_made)
+        first_swap_index = self.resume_progress.pop(0) if self.resume_progress else 0
+        for swap_index in range(first_swap_index, len(possible_swaps)):
+            swap = possible_swaps[swap_index]
             self.swap_values(*swap)
             swaps_attempted = copy(swaps_made)
             swaps_attempted.append(swap)
+            del self.search_progress[depth:]
+            self.search_progress.append(swap_index)
+            if self.checkpoint is not None and self.checkpoint.due():
+                self.save_search_progress()
             swaps = self.find_swaps(swaps_attempted)
             self.swap_values(*swap)
             if swaps:
                 return swaps
 
 
+# Writes out a ripple-carry adder of n_bits bits in the input format, with the outputs of the given pairs of gates
+# swapped. Bit i adds x_i and y_i in sNN, carries in aNN and bNN, and passes its carry on in cNN.
+def ripple_carry_adder(n_bits: int, x_value: int, y_value: int, swaps: list[(str, str)] = ()) -> str:
+    gates = [('x00', 'XOR', 'y00', 'z00'), ('x00', 'AND', 'y00', 'c00')]
+    for bit in range(1, n_bits):
+        carry = f'c{bit - 1:02}'
+        gates += [(f'x{bit:02}', 'XOR', f'y{bit:02}', f's{bit:02}'), (f's{bit:02}', 'XOR', carry, f'z{bit:02}'),
+                  (f'x{bit:02}', 'AND', f'y{bit:02}', f'a{bit:02}'), (f's{bit:02}', 'AND', carry, f'b{bit:02}'),
+                  (f'a{bit:02}', 'OR', f'b{bit:02}', f'c{bit:02}' if bit < n_bits - 1 else f'z{n_bits:02}')]
+    renames = {a: b for swap in swaps for a, b in (swap, reversed(swap))}
+    wires = [f'{name}{bit:02}: {value >> bit & 1}' for name, value in (('x', x_value), ('y', y_value)) for bit in
+             range(n_bits)]
+    gates = [f'{a} {op} {b} -> {renames.get(output, output)}' for a, op, b, output in gates]
+    return '\n'.join(wires) + '\n\n' + '\n'.join(gates) + '\n'
+
+
 def solve_part1(file_name: str) -> int:
-    (x, y), z = read_input(file_name)
+    return solve_part1_from_buffer(read_file(file_name))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    (x, y), z = parse_input(buffer)
     device = Device(x, y, z)
     device.perform_calc()
     return device.get_z()
 
 
-def solve_part2(file_name: str) -> str:
-    (x, y), z = read_input(file_name)
+# The checkpoint holds the gates of the device and the index of the swap being explored at each depth of the search
+def solve_part2(file_name: str, checkpoint_file: str = None, resume: bool = False,
+                checkpoint_interval: float = 60.0) -> str:
+    return solve_part2_from_buffer(read_file(file_name), checkpoint_file, resume, checkpoint_interval)
+
+
+def solve_part2_from_buffer(buffer: str | bytes | memoryview, checkpoint_file: str = None, resume: bool = False,
+                            checkpoint_interval: float = 60.0) -> str:
+    (x, y), z = parse_input(buffer)
     device = Device(x, y, z)
+    if checkpoint_file is not None:
+        device.set_checkpoint(Checkpoint(checkpoint_file, checkpoint_interval), resume)
     # device.swap_by_names('z09', 'nnf')
     # device.swap_by_names('z20','nhs' )
     # device.swap_by_names('kqh','ddn' )
@@ -256,11 +330,26 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 48806532300520, 2: 'ddn,kqh,nhs,nnf,wrc,z09,z20,z34'}
-
-assert_equal(solve_part1('test1.txt'), 2024, f'Incorrect answer to test')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
-assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+if __name__ == '__main__':
+    correct_answers = {1: 48806532300520, 2: 'ddn,kqh,nhs,nnf,wrc,z09,z20,z34'}
 
-for p in [1, 2]:
-    solve_part(p)
+    assert_equal(solve_part1('test1.txt'), 2024, f'Incorrect answer to test')
+    test_adder = ripple_carry_adder(12, 0, 0, [('z02', 'c02'), ('s03', 'a03')])
+    assert_equal(solve_part2_from_buffer(test_adder), 'a03,c02,s03,z02', 'Incorrect answer to the swapped adder.')
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        test_checkpoint_file = os.path.join(temporary_directory, 'checkpoint.json')
+        (test_x, test_y), test_z = parse_input(test_adder)
+        test_device = Device(test_x, test_y, test_z)
+        test_device.set_checkpoint(Checkpoint(test_checkpoint_file, 0, stop_after=3))
+        try:
+            test_device.find_swaps()
+        except SearchInterrupted:
+            pass
+        assert_equal(Checkpoint(test_checkpoint_file, 0).load()['progress'], [2], 'Incorrect interrupted search.')
+        assert_equal(solve_part2_from_buffer(test_adder, test_checkpoint_file, resume=True), 'a03,c02,s03,z02',
+                     'Incorrect answer to the swapped adder after resuming.')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part2('input.txt'), correct_answers[2], f'Incorrect answer to part 2')
+
+    for p in [1, 2]:
+        solve_part(p)
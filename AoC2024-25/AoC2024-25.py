@@ -3,8 +3,18 @@ import time
 from numpy.testing import assert_equal
 
 
+def read_file(input_file: str) -> str:
+    with open(input_file, 'r') as file:
+        return file.read()
+
+
 def read_input(input_file: str) -> (list[list[int]], list[list[int]]):
-    locks_and_keys = [lock_or_key.splitlines() for lock_or_key in open(input_file, 'r').read().split('\n\n')]
+    return parse_input(read_file(input_file))
+
+
+def parse_input(buffer: str | bytes | memoryview) -> (list[list[int]], list[list[int]]):
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    locks_and_keys = [lock_or_key.splitlines() for lock_or_key in text.split('\n\n')]
     keys = []
     locks = []
     for lock_or_key in locks_and_keys:
@@ -24,7 +34,11 @@ def read_input(input_file: str) -> (list[list[int]], list[list[int]]):
 
 
 def solve_part1(file_name: str) -> int:
-    locks, keys = read_input(file_name)
+    return solve_part1_from_buffer(read_file(file_name))
+
+
+def solve_part1_from_buffer(buffer: str | bytes | memoryview) -> int:
+    locks, keys = parse_input(buffer)
     fits = 0
     for lock in locks:
         for key in keys:
@@ -52,9 +66,10 @@ def solve_part(part: int) -> int:
     return answer
 
 
-correct_answers = {1: 3360, 2: -1}
+if __name__ == '__main__':
+    correct_answers = {1: 3360, 2: -1}
 
-assert_equal(solve_part1('test1.txt'), 3, f'Incorrect answer to test')
-assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
+    assert_equal(solve_part1('test1.txt'), 3, f'Incorrect answer to test')
+    assert_equal(solve_part1('input.txt'), correct_answers[1], f'Incorrect answer to part 1')
 
-solve_part(1)
+    solve_part(1)
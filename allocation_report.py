@@ -0,0 +1,137 @@
+import argparse
+import ast
+import linecache
+import os
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def day_script(day: int) -> str:
+    return os.path.join(ROOT, f'AoC2024-{day:02}', f'AoC2024-{day:02}.py')
+
+
+def load_day(day: int) -> dict:
+    # Only the imports and definitions of a day are executed, the asserts and answer printing at the bottom are not
+    script = day_script(day)
+    if not os.path.exists(script):
+        raise Exception(f'There is no Python solution for day {day}.')
+    with open(script, 'r') as file:
+        tree = ast.parse(file.read(), script)
+    tree.body = [node for node in tree.body if
+                 isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef, ast.Assign))]
+    namespace = {'__name__': f'aoc2024_{day:02}', '__file__': script}
+    exec(compile(tree, script, 'exec'), namespace)
+    return namespace
+
+
+def find_solver(namespace: dict, part: int):
+    for name in f'solve_part{part}', 'solve_part1and2':
+        if name in namespace:
+            return namespace[name]
+    raise Exception(f'No solver found for part {part}.')
+
+
+# Attributes an allocation to the innermost frame inside the day script, e.g. a deepcopy is reported at the line in
+# the solver that makes the copy rather than somewhere inside the copy module.
+def allocation_site(traceback: tracemalloc.Traceback, script: str) -> (str, int):
+    frame = next(frame for frame in reversed(traceback) if frame.filename == script)
+    return frame.filename, frame.lineno
+
+
+def group_by_site(statistics: list, script: str) -> dict[(str, int), list[int]]:
+    sites = {}
+    for stat in statistics:
+        site = sites.setdefault(allocation_site(stat.traceback, script), [0, 0])
+        if isinstance(stat, tracemalloc.StatisticDiff):
+            site[0] += stat.size_diff
+            site[1] += stat.count_diff
+        else:
+            site[0] += stat.size
+            site[1] += stat.count
+    return sites
+
+
+class Sampler(threading.Thread):
+    # Takes snapshots while the solver runs and remembers the largest live size and count seen at each site, which
+    # catches temporaries that are freed again before the solver returns.
+    def __init__(self, snapshot_filters: list, script: str, interval: float):
+        super().__init__(daemon=True)
+        self._filters = snapshot_filters
+        self._script = script
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.sites: dict[(str, int), list[int]] = {}
+
+    def run(self):
+        while not self._stop_event.wait(self._interval):
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+            for site, (size, count) in group_by_site(snapshot.statistics('traceback'), self._script).items():
+                high_water = self.sites.setdefault(site, [0, 0])
+                high_water[0] = max(high_water[0], size)
+                high_water[1] = max(high_water[1], count)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def print_sites(title: str, sites: dict[(str, int), list[int]], sort_index: int, top: int):
+    print(f'\n{title}')
+    print(f'{"bytes":>12} {"blocks":>10}  site')
+    ranked = sorted(sites.items(), key=lambda item: -abs(item[1][sort_index]))[:top]
+    for (filename, lineno), (size, count) in ranked:
+        source = linecache.getline(filename, lineno).strip()
+        print(f'{size:>12} {count:>10}  {os.path.basename(filename)}:{lineno}: {source}')
+
+
+def allocation_report(day: int, input_file: str, part: int, top: int = 10, frames: int = 25,
+                      interval: float = 0.0) -> (dict, dict):
+    namespace = load_day(day)
+    solver = find_solver(namespace, part)
+    script = namespace['__file__']
+    # Keeps only memory allocated, directly or through other modules, by the code of the day
+    snapshot_filters = [tracemalloc.Filter(True, script, all_frames=True)]
+    working_directory = os.getcwd()
+    os.chdir(os.path.dirname(script))
+    tracemalloc.start(frames)
+    try:
+        sampler = Sampler(snapshot_filters, script, interval) if interval > 0 else None
+        before = tracemalloc.take_snapshot().filter_traces(snapshot_filters)
+        if sampler is not None:
+            sampler.start()
+        duration = time.perf_counter()
+        answer = solver(input_file)
+        duration = time.perf_counter() - duration
+        if sampler is not None:
+            sampler.stop()
+        after = tracemalloc.take_snapshot().filter_traces(snapshot_filters)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        os.chdir(working_directory)
+    retained = group_by_site(after.compare_to(before, 'traceback'), script)
+    transient = sampler.sites if sampler is not None else {}
+    print(f'Day {day}, part {part}: {answer}, found in {duration:.2e} seconds (peak traced memory {peak} bytes)')
+    print_sites('Top sites by retained bytes:', retained, 0, top)
+    print_sites('Top sites by retained blocks:', retained, 1, top)
+    if sampler is not None:
+        print_sites('Top sites by sampled live bytes:', transient, 0, top)
+        print_sites('Top sites by sampled live blocks:', transient, 1, top)
+    return retained, transient
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reports which lines of a solution allocate the most memory.')
+    parser.add_argument('day', type=int)
+    parser.add_argument('input_file', nargs='?', default='input.txt',
+                        help='relative to the directory of the day')
+    parser.add_argument('--part', type=int, default=1)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--frames', type=int, default=25, help='number of frames stored per allocation')
+    parser.add_argument('--interval', type=float, default=0.0,
+                        help='seconds between snapshots taken while the solver runs, 0 disables sampling')
+    args = parser.parse_args()
+    allocation_report(args.day, args.input_file, args.part, args.top, args.frames, args.interval)
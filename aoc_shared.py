@@ -0,0 +1,59 @@
+import functools
+import json
+import operator
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+class SearchInterrupted(Exception):
+    pass
+
+
+# Saves the state of a long search every interval seconds so an interrupted search can be resumed. The solvers using it
+# take checkpoint_file, checkpoint_interval and resume arguments: without a checkpoint file nothing is saved, and with
+# resume the search continues from the state saved in the file instead of starting over. With stop_after the search is
+# interrupted by a SearchInterrupted exception once that many states are saved, which splits a search into runs of
+# limited length.
+class Checkpoint:
+    def __init__(self, checkpoint_file: str, interval: float, stop_after: int = None):
+        self._file = checkpoint_file
+        self._interval = interval
+        self._stop_after = stop_after
+        self._n_saves = 0
+        self._last_save = time.perf_counter()
+
+    def load(self) -> dict or None:
+        if not os.path.exists(self._file):
+            return None
+        with open(self._file, 'r') as file:
+            return json.load(file)
+
+    def due(self) -> bool:
+        return time.perf_counter() - self._last_save >= self._interval
+
+    def save(self, state: dict):
+        # Written to a temporary file first so an interruption while saving does not destroy the last checkpoint
+        temporary_file = self._file + '.tmp'
+        with open(temporary_file, 'w') as file:
+            json.dump(state, file)
+        os.replace(temporary_file, self._file)
+        self._last_save = time.perf_counter()
+        self._n_saves += 1
+        if self._stop_after is not None and self._n_saves >= self._stop_after:
+            raise SearchInterrupted(f'Search interrupted after {self._n_saves} saves to {self._file}.')
+
+
+# Splits independent records into chunks, applies the mapper to every chunk in a process pool and combines the results
+# with the reducer. Fewer records than min_parallel_size are handled serially, where the pool would cost more than it
+# saves. Starting the pool takes some tens of milliseconds, so each day sets the threshold from the cost of a record.
+def map_reduce(records: list, mapper, min_parallel_size: int, reducer=operator.add, initial=0, chunk_size: int = None,
+               processes: int = None):
+    if len(records) < min_parallel_size:
+        return reducer(initial, mapper(records))
+    processes = os.cpu_count() if processes is None else processes
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(records) // (4 * processes)))
+    chunks = [records[start:start + chunk_size] for start in range(0, len(records), chunk_size)]
+    with ProcessPoolExecutor(processes) as executor:
+        return functools.reduce(reducer, executor.map(mapper, chunks), initial)